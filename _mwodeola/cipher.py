@@ -1,37 +1,64 @@
 import base64
 from django.conf import settings
 
-from Crypto import Random
 from Crypto.Cipher import AES
+from Crypto.Random import get_random_bytes
 
 
 SECRET_KEY_AES = settings.SECRET_KEY_AES.encode()
-BS = 16
-pad = lambda s: s + (BS - len(s.encode('utf-8')) % BS) * chr(BS - len(s.encode('utf-8')) % BS)
-unpad = lambda s: s[:-ord(s[len(s) - 1:])]
+BS = AES.block_size
+
+
+def pad(raw: bytes) -> bytes:
+    n = BS - len(raw) % BS
+    return raw + bytes([n]) * n
+
+
+def unpad(raw: bytes) -> bytes:
+    return raw[:-raw[-1]]
 
 
 class AESCipher:
+    """
+    AES-256-CBC, base64(iv + ciphertext) 형식.
+
+    encrypt_many()/decrypt_many() 는 여러 값을 한 번에 처리함:
+    IV 는 한 번의 CSPRNG 읽기로 받아오고, 암복호화는 값마다 라이브러리 CBC(AES.MODE_CBC) 로 함.
+    """
+
     def __init__(self, key=SECRET_KEY_AES):
         self.key = key
         # self.key = hashlib.sha256(key.encode()).digest()
 
     def encrypt(self, raw):
-        if raw is None:
-            return None
-        else:
-            raw = pad(raw)
-            iv = Random.new().read(AES.block_size)
-            cipher = AES.new(self.key, AES.MODE_CBC, iv)
-            return base64.b64encode(iv + cipher.encrypt(raw.encode('utf-8'))).decode()
-            # return base64.b64encode(iv + cipher.encrypt(raw.encode('utf-8')))
+        return self.encrypt_many([raw])[0]
 
     def decrypt(self, enc):
-        if enc is None:
-            return None
-        else:
-            enc = base64.b64decode(enc)
-            iv = enc[:16]
+        return self.decrypt_many([enc])[0]
+
+    def encrypt_many(self, raws) -> list:
+        results = [None] * len(raws)
+
+        indexes = [i for i, raw in enumerate(raws) if raw is not None]
+        if not indexes:
+            return results
+
+        ivs = get_random_bytes(BS * len(indexes))
+        for k, i in enumerate(indexes):
+            iv = ivs[k * BS:(k + 1) * BS]
             cipher = AES.new(self.key, AES.MODE_CBC, iv)
-            return unpad(cipher.decrypt(enc[16:])).decode()
-            # return unpad(cipher.decrypt(enc[16:]))
+            results[i] = base64.b64encode(iv + cipher.encrypt(pad(raws[i].encode('utf-8')))).decode()
+
+        return results
+
+    def decrypt_many(self, encs) -> list:
+        results = [None] * len(encs)
+
+        for i, enc in enumerate(encs):
+            if enc is None:
+                continue
+            enc = base64.b64decode(enc)
+            cipher = AES.new(self.key, AES.MODE_CBC, enc[:BS])
+            results[i] = unpad(cipher.decrypt(enc[BS:])).decode()
+
+        return results
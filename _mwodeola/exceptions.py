@@ -43,6 +43,16 @@ class NotOwnerDataException(MyException):
         self.status_code = status.HTTP_403_FORBIDDEN
 
 
+class ServiceUnavailableException(MyException):
+
+    def __init__(self, **kwargs):
+        message = 'Server is busy. Please try again later.'
+        code = 'service_unavailable'
+        super().__init__(message, code)
+        self.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        self.detail['detail'] = kwargs
+
+
 def custom_exception_Handler(exc, context):
     # Call REST framework's default exception handler first,
     # to get the standard error response.
@@ -58,6 +58,17 @@ AUTH_USER_MODEL = 'mwodeola_users.MwodeolaUser'
 
 AUTH_LIMIT = 10
 
+# 비밀번호 인증 시도 제한. scope -> (최대 시도 횟수, 기간(초)). 한도를 넘으면 해시 계산 없이 429
+AUTH_RATE_LIMITS = {
+    'ip': (60, 60),
+    'phone_number': (20, 60),
+}
+
+# AccountDetail 조회수 일괄 반영 주기(초) / 버퍼 크기
+# 반영 주기마다 worker 의 daemon 스레드가 반영하므로, worker 가 강제 종료되면 최대 이 시간만큼의 조회수를 잃음
+ACCOUNT_VIEWS_FLUSH_INTERVAL = 10
+ACCOUNT_VIEWS_FLUSH_SIZE = 500
+
 INSTALLED_APPS = [
     'django.contrib.admin',
     'django.contrib.auth',
@@ -171,6 +182,76 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.0/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # AutofillService 조회 결과(복호화된 값 포함) 캐시. 프로세스 밖으로 내보내지 않도록 LocMemCache 유지.
+    'autofill': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'autofill',
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    },
+    # access 토큰 인증용 user 캐시(비밀번호 해시 포함). 프로세스 밖으로 내보내지 않도록 LocMemCache 유지.
+    'auth': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'auth',
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    },
+}
+
+# 'autofill' 캐시는 프로세스 로컬이라 무효화가 쓰기 요청을 처리한 프로세스에만 반영됨.
+# uwsgi worker 1개(.config/uwsgi/mwodeola.ini 에 processes 미설정)를 전제로 하며,
+# worker 를 늘리면 다른 worker 는 수정/삭제된 계정(복호화된 비밀번호 포함)을 최대 이 시간(초) 동안 내려줄 수 있음.
+ACCOUNT_AUTOFILL_CACHE_TIMEOUT = 30
+
+# 목록 조회 keyset 페이지네이션(cursor, page_size 파라미터). page_size 생략 시 기본값 / 최대값
+ACCOUNT_PAGE_SIZE = 100
+ACCOUNT_PAGE_SIZE_MAX = 500
+
+# access 토큰 인증 시 user 조회 캐시(초). 다른 프로세스에서 바뀐 잠금/탈퇴 상태는 이 시간 이내에 반영됨.
+AUTH_USER_CACHE_TIMEOUT = 30
+
+# True 이면 비밀번호 변경 시 이전에 발급된 모든 토큰을 무효화하고, 응답에 새 refresh/access 토큰을 내려줌
+# (클라이언트는 응답의 토큰으로 교체해야 하며, 그렇지 않으면 다음 요청에서 401 token_revoked).
+# refresh 토큰은 DB 블랙리스트로 막지만 access 토큰의 무효화 시각은 프로세스 로컬 캐시에 있어서
+# 다른 worker 와 재시작 이후에는 access 토큰이 만료될 때까지 유효함 (uwsgi worker 1개 전제).
+AUTH_REVOKE_TOKENS_ON_PASSWORD_CHANGE = False
+
+
+# Password hashing
+# https://docs.djangoproject.com/en/4.0/topics/auth/passwords/
+# 첫 번째 hasher 로 새 비밀번호를 해시하고, 나머지는 기존 해시 검증용. 비용은 manage.py benchmark_hashers 로 측정.
+
+PASSWORD_HASHERS = [
+    'mwodeola_users.hashers.PBKDF2PasswordHasher',
+    'mwodeola_users.hashers.ScryptPasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+]
+
+PASSWORD_PBKDF2_ITERATIONS = 320000
+PASSWORD_SCRYPT_WORK_FACTOR = 2 ** 14
+
+# 비밀번호 해시 계산용 프로세스 풀 (mwodeola_users/auth/hashing.py). 대기 중인 해시가 MAX_PENDING 을 넘으면 503
+# WORKERS 가 0 이면 풀 없이 요청 스레드에서 계산함. 풀을 켜면 PYTHON 에 worker 용 인터프리터를 지정
+# (uwsgi 에서는 sys.executable 이 uwsgi 바이너리, None 이면 virtualenv 의 bin/python)
+AUTH_HASHING = {
+    'WORKERS': 0,
+    'MAX_PENDING': 32,
+    'TIMEOUT': 10,
+    'PYTHON': None,
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.0/ref/settings/#auth-password-validators
 
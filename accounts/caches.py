@@ -0,0 +1,61 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+AUTOFILL_CACHE_ALIAS = 'autofill'
+
+AUTOFILL_CACHE_TIMEOUT_DEFAULT = 30  # seconds
+AUTOFILL_CACHE_TIMEOUT = getattr(settings, "ACCOUNT_AUTOFILL_CACHE_TIMEOUT", AUTOFILL_CACHE_TIMEOUT_DEFAULT)
+
+
+class AutofillCache:
+    """
+    GET account/for_autofill_service 의 응답을 (user, app_package_name) 단위로 캐시함.
+
+    무효화는 user 단위 버전 키를 올리는 방식이라, accounts/serializers.py 의 모든 쓰기 경로에서
+    invalidate(user_id) 한 번만 호출하면 그 user 의 모든 패키지 캐시가 함께 무효화됨.
+    복호화된 비밀번호가 들어가므로 'autofill' 캐시는 프로세스 로컬(LocMemCache)로만 설정해야 함.
+
+    LocMemCache 라 invalidate() 는 쓰기 요청을 처리한 프로세스에만 반영됨. uwsgi worker 가 하나인 배포를 전제로 하며,
+    worker 가 여럿이면 다른 worker 는 수정/삭제된 계정을 최대 timeout 초 동안 계속 내려줄 수 있음.
+    """
+
+    def __init__(self, alias=AUTOFILL_CACHE_ALIAS, timeout=AUTOFILL_CACHE_TIMEOUT):
+        self.alias = alias
+        self.timeout = timeout
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def get(self, user_id, app_package_name):
+        """
+        (key, payload). 캐시에 없으면 payload 는 None 이고, DB 에서 읽은 결과는 같은 key 로 set() 해야 함.
+        key 를 DB 조회 전에 정해두므로, 조회 도중 invalidate() 되면 옛 버전 key 에 저장되어 읽히지 않음.
+        """
+        key = self._key(user_id, app_package_name)
+        return key, self.cache.get(key)
+
+    def set(self, key, payload):
+        self.cache.set(key, payload, self.timeout)
+
+    def invalidate(self, user_id):
+        key = self._version_key(user_id)
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            self.cache.set(key, 1, None)
+
+    def _key(self, user_id, app_package_name):
+        version = self.cache.get(self._version_key(user_id), 0)
+        package_hash = hashlib.sha1(app_package_name.encode()).hexdigest()
+        return f'autofill:{user_id}:{version}:{package_hash}'
+
+    @classmethod
+    def _version_key(cls, user_id):
+        return f'autofill:version:{user_id}'
+
+
+autofill_cache = AutofillCache()
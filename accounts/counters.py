@@ -0,0 +1,138 @@
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.db.models import F
+
+from .models import AccountDetail
+
+
+VIEWS_FLUSH_INTERVAL_DEFAULT = 10  # seconds
+VIEWS_FLUSH_INTERVAL = getattr(settings, "ACCOUNT_VIEWS_FLUSH_INTERVAL", VIEWS_FLUSH_INTERVAL_DEFAULT)
+
+VIEWS_FLUSH_SIZE_DEFAULT = 500
+VIEWS_FLUSH_SIZE = getattr(settings, "ACCOUNT_VIEWS_FLUSH_SIZE", VIEWS_FLUSH_SIZE_DEFAULT)
+
+# SQLite 의 바인딩 파라미터 제한(999)을 넘지 않도록 나눠서 UPDATE
+UPDATE_BATCH_SIZE = 500
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCountBuffer:
+    """
+    AccountDetail.views 증가분을 메모리에 모아두었다가
+    증가량이 같은 detail 끼리 묶어 'UPDATE ... SET views = views + n' 으로 반영함.
+
+    add() 에서 max_size / interval 을 넘으면 반영하고, 요청이 없어도 프로세스마다 하나씩 도는
+    daemon 스레드가 interval 마다 반영함. uwsgi 가 worker 를 강제 종료하면 atexit 이 실행되지 않을 수 있어
+    그때 잃는 조회수는 최대 interval 초 동안 쌓인 증가분임.
+    """
+
+    def __init__(self, interval=VIEWS_FLUSH_INTERVAL, max_size=VIEWS_FLUSH_SIZE):
+        self.interval = interval
+        self.max_size = max_size
+
+        self._lock = threading.Lock()
+        self._counts = defaultdict(int)
+        self._last_flushed_at = time.monotonic()
+        self._flusher_pid = None
+
+    def add(self, detail_id, n=1):
+        self._start_flusher()
+
+        with self._lock:
+            self._counts[detail_id] += n
+            is_due = len(self._counts) >= self.max_size or \
+                time.monotonic() - self._last_flushed_at >= self.interval
+
+        if is_due:
+            self.flush()
+
+    def add_many(self, detail_ids):
+        for detail_id in detail_ids:
+            self.add(detail_id)
+
+    def pending(self, detail_id) -> int:
+        with self._lock:
+            return self._counts.get(detail_id, 0)
+
+    def flush(self) -> bool:
+        # 반영에 실패해도 예외를 올리지 않음 (flush 를 트리거한 조회 요청이 실패하지 않도록)
+        with self._lock:
+            counts = self._counts
+            self._counts = defaultdict(int)
+            self._last_flushed_at = time.monotonic()
+
+        if not counts:
+            return True
+
+        batches = []
+        detail_ids_by_increment = defaultdict(list)
+        for detail_id, n in counts.items():
+            detail_ids_by_increment[n].append(detail_id)
+        for n, detail_ids in detail_ids_by_increment.items():
+            for i in range(0, len(detail_ids), UPDATE_BATCH_SIZE):
+                batches.append((n, detail_ids[i:i + UPDATE_BATCH_SIZE]))
+
+        for index, (n, detail_ids) in enumerate(batches):
+            try:
+                # 요청의 트랜잭션 안에서 호출되어도 실패가 바깥 트랜잭션을 깨뜨리지 않도록 savepoint 로 감쌈
+                with transaction.atomic():
+                    AccountDetail.objects \
+                        .filter(id__in=detail_ids) \
+                        .update(views=F('views') + n)
+            except DatabaseError:
+                # 반영하지 못한 증가분(이번 batch 부터)은 버퍼에 되돌려 다음 flush 때 다시 시도
+                logger.exception('Failed to flush account detail view counts')
+                with self._lock:
+                    for n, detail_ids in batches[index:]:
+                        for detail_id in detail_ids:
+                            self._counts[detail_id] += n
+                return False
+        return True
+
+    def _start_flusher(self):
+        # uwsgi master 에서 import 된 뒤 fork 되면 스레드는 worker 로 복사되지 않으므로 프로세스마다 시작함
+        pid = os.getpid()
+        if self._flusher_pid == pid:
+            return
+
+        with self._lock:
+            if self._flusher_pid == pid:
+                return
+            self._flusher_pid = pid
+
+        thread = threading.Thread(target=self._run_flusher, name='view-count-flusher', daemon=True)
+        thread.start()
+
+    def _run_flusher(self):
+        while True:
+            time.sleep(self.interval)
+            if not self._counts:
+                continue
+            # 어떤 예외로도 스레드가 끝나지 않도록 함 (끝나면 이후 조회수는 프로세스 종료 때까지 반영되지 않음)
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('Unexpected error in the view count flusher')
+            finally:
+                # 이 스레드의 DB 연결을 다음 주기까지 잡아두지 않음
+                try:
+                    connection.close()
+                except Exception:
+                    logger.exception('Failed to close the view count flusher connection')
+
+
+def _flush_at_exit():
+    # 프로세스 종료 시점에는 DB 가 이미 닫혔을 수 있음 (실패는 flush() 가 로그로 남김)
+    view_counter.flush()
+
+
+view_counter = ViewCountBuffer()
+atexit.register(_flush_at_exit)
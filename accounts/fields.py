@@ -0,0 +1,67 @@
+from django.core.exceptions import ValidationError
+from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
+
+
+class UserPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    요청한 user 의 객체만 찾는 PrimaryKeyRelatedField.
+    소유자 조건(user_field)과 select_related 를 한 번의 쿼리로 처리하며, 다른 user 의 객체는 없는 객체로 처리함(does_not_exist).
+    user 는 최상위 serializer 의 user 속성(accounts.serializers.BaseSerializer)을 사용함.
+
+        account_id = UserPrimaryKeyRelatedField(queryset=Account.objects.all(),
+                                                user_field='own_group__mwodeola_user',
+                                                select_related=('own_group',))
+
+    many=True 이면 모든 id 를 한 번의 pk__in 쿼리로 찾음.
+    """
+
+    def __init__(self, user_field='mwodeola_user', select_related=(), **kwargs):
+        self.user_field = user_field
+        self.select_related = select_related
+        super().__init__(**kwargs)
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **{
+            key: value for key, value in kwargs.items() if key not in MANY_RELATION_KWARGS
+        })}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return UserManyRelatedField(**list_kwargs)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        user = getattr(self.root, 'user', None)
+        if user is None:
+            return queryset.none()
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        return queryset.filter(**{self.user_field: user.id})
+
+    def to_pk(self, data):
+        if self.pk_field is not None:
+            data = self.pk_field.to_internal_value(data)
+        try:
+            return self.queryset.model._meta.pk.to_python(data)
+        except (TypeError, ValueError, ValidationError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+
+    def to_internal_value_many(self, data):
+        pks = [self.to_pk(item) for item in data]
+        objects = {obj.pk: obj for obj in self.get_queryset().filter(pk__in=pks)}
+        for pk in pks:
+            if pk not in objects:
+                self.fail('does_not_exist', pk_value=pk)
+        return [objects[pk] for pk in pks]
+
+
+class UserManyRelatedField(serializers.ManyRelatedField):
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+        return self.child_relation.to_internal_value_many(data)
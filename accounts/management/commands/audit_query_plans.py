@@ -0,0 +1,166 @@
+import re
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from accounts import search, queries, views
+from accounts.models import SNS
+from accounts.models_serializers import (
+    AccountGroupSerializerForRead,
+    AccountSerializerForRead,
+    AccountSerializerSimpleForRead,
+    AccountSerializerSimpleForSearch,
+    annotate_group_stats,
+)
+from accounts.pagination import KeysetPaginator
+from accounts.serializers import SYNC_CURSOR_OVERLAP
+
+
+# vendor -> 전체 스캔을 나타내는 EXPLAIN 출력 (group 1: 테이블명)
+FULL_SCAN_PATTERNS = {
+    'sqlite': re.compile(r'\bSCAN (?!CONSTANT ROW)(\w+)'),
+    'postgresql': re.compile(r'\bSeq Scan on (\w+)'),
+}
+
+# vendor -> 인덱스 순서를 쓰지 못하고 따로 정렬함을 나타내는 EXPLAIN 출력
+SORT_PATTERNS = {
+    'sqlite': re.compile(r'\bUSE TEMP B-TREE FOR ORDER BY'),
+    'postgresql': re.compile(r'\bSort\b'),
+}
+
+# 행 수가 고정된 작은 테이블은 스캔해도 됨
+ALLOWED_SCAN_TABLES = {SNS._meta.db_table}
+
+# keyset 정렬 필드 -> cursor 에 넣을 값
+SAMPLE_CURSOR_VALUES = {
+    'created_at': '2022-01-01T00:00:00+00:00',
+    'id': '00000000-0000-0000-0000-000000000000',
+    'user_id': 'a',
+}
+
+
+def get_page_queryset(view_class, queryset, list_serializer=None):
+    # view 의 keyset 정렬로, 첫 페이지가 아닌 페이지(cursor 조건 포함)를 조회하는 쿼리
+    paginator = KeysetPaginator(ordering=view_class.pagination_ordering)
+    key = [SAMPLE_CURSOR_VALUES[field] for field in paginator.ordering]
+    paginator.cursor = paginator.encode_cursor(key)
+    if list_serializer is not None:
+        queryset = list_serializer.get_iterable(queryset)
+    return paginator.page_queryset(queryset)
+
+
+def get_endpoint_queries(user_id):
+    """
+    (이름, queryset, keyset 페이지 여부) 목록.
+    각 endpoint 와 같은 accounts.queries / accounts.search 함수로 만들고, 목록 응답은 해당 list serializer 의
+    get_iterable()(통계 annotate, select_related) 과 view 의 페이지 정렬까지 적용한 쿼리를 검사함.
+    keyset 페이지 쿼리는 인덱스 순서로 읽어야 페이지 크기만큼만 읽으므로 별도 정렬도 보고함.
+    """
+    group_id = uuid.uuid4()
+    detail_id = uuid.uuid4()
+    since = timezone.now() - SYNC_CURSOR_OVERLAP
+
+    group_list = AccountGroupSerializerForRead(many=True)
+    account_list = AccountSerializerForRead(many=True)
+    account_simple_list = AccountSerializerSimpleForRead(many=True)
+    search_account_list = AccountSerializerSimpleForSearch(many=True)
+
+    groups = queries.get_groups(user_id)
+    group_accounts = queries.get_group_accounts(group_id)
+    search_groups = search.search_groups(user_id, 'ab')
+    search_accounts = search.search_accounts_by_user_id(user_id, 'ab')
+    user_ids = queries.get_user_ids(user_id)
+    sync_groups, sync_details, sync_accounts, sync_tombstones = queries.get_sync_querysets(user_id, since)
+    export_groups, export_details, export_accounts = queries.get_export_querysets(user_id)
+
+    return [
+        ('account/group', group_list.get_iterable(groups), False),
+        ('account/group (page)', get_page_queryset(views.AccountGroupView, groups, group_list), True),
+        ('account/group (get)', groups.filter(id=group_id), False),
+        ('account/group (orphans)', queries.get_orphan_groups(user_id).values('id'), False),
+        ('account/group/sns', group_list.get_iterable(queries.get_sns_groups(user_id)), False),
+        ('account/group/detail (group)', annotate_group_stats(groups).filter(id=group_id), False),
+        ('account/group/detail (detail)',
+         queries.get_details(user_id).select_related('group').filter(id=detail_id), False),
+        ('account/group/detail (account)', group_accounts.select_related('sns_group').filter(detail=detail_id), False),
+        ('account/group/detail/all', account_list.get_iterable(group_accounts), False),
+        ('account/group/detail/all (page)',
+         get_page_queryset(views.AccountGroupDetailAllView, group_accounts, account_list), True),
+        ('account/group/detail/all/simple (page)',
+         get_page_queryset(views.AccountGroupDetailAllSimpleView, group_accounts, account_simple_list), True),
+        ('account/search/group', group_list.get_iterable(search_groups), False),
+        # 검색 페이지는 검색 색인으로 일치한 행만 정렬하므로 정렬은 보고하지 않음 (전체 스캔만 검사)
+        ('account/search/group (page)',
+         get_page_queryset(views.AccountSearchGroupView, search_groups, group_list), False),
+        ('account/search/detail', search_account_list.get_iterable(search_accounts), False),
+        ('account/search/detail (page)',
+         get_page_queryset(views.AccountSearchDetailView, search_accounts, search_account_list), False),
+        ('account/user_id/all', user_ids, False),
+        ('account/user_id/all (page)', get_page_queryset(views.AccountUserIdsView, user_ids), True),
+        ('account/for_autofill_service (group)', queries.get_autofill_groups(user_id, 'com.example'), False),
+        ('account/for_autofill_service (account)', account_list.get_iterable(queries.get_autofill_accounts([group_id])),
+         False),
+        ('account/for_autofill_service (detail)', queries.get_autofill_detail(group_id, 'a'), False),
+        ('account/for_autofill_service (views)', queries.get_detail_views([detail_id]), False),
+        ('account/sync (group)', group_list.get_iterable(sync_groups), False),
+        ('account/sync (detail)', sync_details, False),
+        ('account/sync (account)', sync_accounts, False),
+        ('account/sync (tombstone)', sync_tombstones, False),
+        ('account/export (group)', group_list.get_iterable(export_groups), False),
+        ('account/export (detail)', export_details, False),
+        ('account/export (account)', export_accounts, False),
+    ]
+
+
+class Command(BaseCommand):
+    """
+    account endpoint 들의 쿼리를 EXPLAIN 하여 전체 테이블 스캔과 keyset 페이지의 별도 정렬을 보고함.
+    인덱스/조회 조건 변경 후, 또는 CI 에서 --fail-on-scan 으로 실행:
+        python manage.py audit_query_plans --fail-on-scan
+    -v 2 이면 전체 실행 계획을 출력함.
+    """
+    help = 'Reports full table scans (and sorts of keyset pages) in the query plans of the account endpoints'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fail-on-scan', action='store_true',
+                            help='Exit with an error if any query does a full table scan')
+
+    def handle(self, *args, **options):
+        scan_pattern = FULL_SCAN_PATTERNS.get(connection.vendor, None)
+        sort_pattern = SORT_PATTERNS.get(connection.vendor, None)
+        if scan_pattern is None:
+            raise CommandError(f'Unsupported database vendor: {connection.vendor}')
+
+        verbosity = options['verbosity']
+        scans = 0
+
+        for name, queryset, paged in get_endpoint_queries(uuid.uuid4()):
+            plan = queryset.explain()
+            found = []
+            for line in plan.splitlines():
+                match = scan_pattern.search(line)
+                if match and match.group(1) not in ALLOWED_SCAN_TABLES:
+                    found.append(('full scan', line.strip()))
+                elif paged and sort_pattern.search(line):
+                    found.append(('sort', line.strip()))
+
+            if found:
+                scans += len(found)
+                self.stdout.write(self.style.WARNING(f'{found[0][0]}: {name}'))
+                for kind, line in found:
+                    self.stdout.write(f'    [{kind}] {line}')
+            elif verbosity >= 1:
+                self.stdout.write(f'ok: {name}')
+
+            if verbosity >= 2:
+                for line in plan.splitlines():
+                    self.stdout.write(f'      {line}')
+
+        if scans == 0:
+            self.stdout.write(self.style.SUCCESS('No full table scans or sorts'))
+        elif options['fail_on_scan']:
+            raise CommandError(f'{scans} full table scans or sorts')
+        else:
+            self.stdout.write(self.style.WARNING(f'{scans} full table scans or sorts'))
@@ -0,0 +1,35 @@
+# Generated by Django 4.0.1 on 2026-10-17 15:03
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('accounts', '0006_alter_accountdetail_memo'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='accountgroup',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.CreateModel(
+            name='AccountTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_type', models.SmallIntegerField(choices=[(0, 'GROUP'), (1, 'DETAIL'), (2, 'ACCOUNT')])),
+                ('object_id', models.UUIDField()),
+                ('deleted_at', models.DateTimeField(auto_now_add=True)),
+                ('mwodeola_user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='account_tombstone', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='accounttombstone',
+            index=models.Index(fields=['mwodeola_user', 'deleted_at'], name='accounts_ac_mwodeol_868a04_idx'),
+        ),
+    ]
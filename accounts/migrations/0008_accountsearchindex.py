@@ -0,0 +1,32 @@
+# Generated by Django 4.0.1 on 2026-10-17 15:04
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('accounts', '0007_accountgroup_updated_at_accounttombstone'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AccountSearchIndex',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('field_type', models.SmallIntegerField(choices=[(0, 'GROUP_NAME'), (1, 'USER_ID')])),
+                ('suffix', models.CharField(max_length=100)),
+                ('position', models.SmallIntegerField()),
+                ('detail', models.ForeignKey(default=None, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='search_index_detail', to='accounts.accountdetail')),
+                ('group', models.ForeignKey(default=None, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='search_index_group', to='accounts.accountgroup')),
+                ('mwodeola_user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='account_search_index', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='accountsearchindex',
+            index=models.Index(fields=['mwodeola_user', 'field_type', 'suffix'], name='accounts_ac_mwodeol_f8c1d0_idx'),
+        ),
+    ]
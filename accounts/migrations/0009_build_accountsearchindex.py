@@ -0,0 +1,60 @@
+from django.db import migrations
+
+SEARCH_GROUP_NAME = 0
+SEARCH_USER_ID = 1
+
+
+def make_suffixes(value):
+    if value is None:
+        return []
+    value = value.lower()
+    return [(value[i:], i) for i in range(len(value))]
+
+
+BATCH_SIZE = 1000
+
+
+def build_search_index(apps, schema_editor):
+    AccountGroup = apps.get_model('accounts', 'AccountGroup')
+    AccountDetail = apps.get_model('accounts', 'AccountDetail')
+    AccountSearchIndex = apps.get_model('accounts', 'AccountSearchIndex')
+
+    # 색인 행은 BATCH_SIZE 만큼 모일 때마다 저장하고 비움 (전체 행을 메모리에 모으지 않음)
+    rows = []
+
+    def flush(force=False):
+        if rows and (force or len(rows) >= BATCH_SIZE):
+            AccountSearchIndex.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+            rows.clear()
+
+    for group in AccountGroup.objects.only('id', 'mwodeola_user_id', 'group_name').iterator(chunk_size=BATCH_SIZE):
+        for suffix, position in make_suffixes(group.group_name):
+            rows.append(AccountSearchIndex(
+                mwodeola_user_id=group.mwodeola_user_id, group_id=group.id,
+                field_type=SEARCH_GROUP_NAME, suffix=suffix, position=position))
+        flush()
+
+    details = AccountDetail.objects.values_list('id', 'user_id', 'group__mwodeola_user_id')
+    for detail_id, user_id, mwodeola_user_id in details.iterator(chunk_size=BATCH_SIZE):
+        for suffix, position in make_suffixes(user_id):
+            rows.append(AccountSearchIndex(
+                mwodeola_user_id=mwodeola_user_id, detail_id=detail_id,
+                field_type=SEARCH_USER_ID, suffix=suffix, position=position))
+        flush()
+
+    flush(force=True)
+
+
+def clear_search_index(apps, schema_editor):
+    apps.get_model('accounts', 'AccountSearchIndex').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_accountsearchindex'),
+    ]
+
+    operations = [
+        migrations.RunPython(build_search_index, clear_search_index),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.0.1 on 2026-10-17 15:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_build_accountsearchindex'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='account',
+            index=models.Index(fields=['own_group', 'sns_group'], name='accounts_ac_own_gro_1f8a87_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='account',
+            index=models.Index(fields=['own_group', 'created_at', 'id'], name='accounts_ac_own_gro_5f280c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='accountdetail',
+            index=models.Index(fields=['group', 'user_id'], name='accounts_ac_group_i_a65a48_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='accountgroup',
+            index=models.Index(fields=['mwodeola_user', 'created_at', 'id'], name='accounts_ac_mwodeol_7a6923_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='accountgroup',
+            index=models.Index(fields=['mwodeola_user', 'updated_at'], name='accounts_ac_mwodeol_992076_idx'),
+        ),
+    ]
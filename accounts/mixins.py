@@ -1,13 +1,14 @@
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
 
 from _mwodeola import exceptions
-from .models import SNS, AccountGroup, AccountDetail, Account
+from .models import SNS, AccountDetail, Account
+from . import queries
 
 
 class AccountMixin:
 
     def get_all_account_group_by(self, request):
-        return AccountGroup.objects.filter(mwodeola_user=request.user)
+        return queries.get_groups(request.user.id)
 
     def get_account_group(self, request):
         account_group_id = request.data.get('id', None)
@@ -15,19 +16,13 @@ class AccountMixin:
         if account_group_id is None:
             raise exceptions.FieldException(id='required field')
 
+        # 소유자 조건을 쿼리에 포함 (다른 user 의 group 은 없는 group 으로 처리)
         try:
-            account_group = AccountGroup.objects.get(id=account_group_id)
+            account_group = queries.get_groups(request.user.id).get(id=account_group_id)
         except ValidationError as e:
             raise exceptions.FieldException(id=e)
         except ObjectDoesNotExist as e:
             raise exceptions.FieldException(id=e.args)
 
-        if not self._match_user_account_group(request.user, account_group):
-            raise exceptions.NotOwnerDataException()
-
         return account_group
 
-    @classmethod
-    def _match_user_account_group(cls, user, account_group) -> bool:
-        return user.id == account_group.mwodeola_user.id
-
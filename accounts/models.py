@@ -10,6 +10,24 @@ ICON_TYPE = [
     (3, 'SNS'),
 ]
 
+TOMBSTONE_GROUP = 0
+TOMBSTONE_DETAIL = 1
+TOMBSTONE_ACCOUNT = 2
+
+TOMBSTONE_TYPE = [
+    (TOMBSTONE_GROUP, 'GROUP'),
+    (TOMBSTONE_DETAIL, 'DETAIL'),
+    (TOMBSTONE_ACCOUNT, 'ACCOUNT'),
+]
+
+SEARCH_GROUP_NAME = 0
+SEARCH_USER_ID = 1
+
+SEARCH_FIELD_TYPE = [
+    (SEARCH_GROUP_NAME, 'GROUP_NAME'),
+    (SEARCH_USER_ID, 'USER_ID'),
+]
+
 
 # SNS
 class SNS(models.Model):
@@ -39,6 +57,7 @@ class AccountGroup(models.Model):
     is_favorite = models.BooleanField(null=False, blank=False, default=False)
 
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         if self.sns is None:
@@ -61,6 +80,13 @@ class AccountGroup(models.Model):
                 name='Unique sns_group name to user'
             )
         ]
+        # (mwodeola_user, app_package_name), (mwodeola_user, sns) 조회는 위 unique 제약의 인덱스를 사용함
+        indexes = [
+            # 목록 keyset 페이지네이션, export 정렬
+            models.Index(fields=['mwodeola_user', 'created_at', 'id']),
+            # account/sync
+            models.Index(fields=['mwodeola_user', 'updated_at']),
+        ]
 
 
 # AccountDetail
@@ -84,6 +110,12 @@ class AccountDetail(models.Model):
             return ""
         return self.user_id
 
+    class Meta:
+        indexes = [
+            # autofill 의 (group, user_id) 조회, account/user_id/all
+            models.Index(fields=['group', 'user_id']),
+        ]
+
 
 # Account
 class Account(models.Model):
@@ -104,3 +136,51 @@ class Account(models.Model):
                 name='Unique detail within group'
             ),
         ]
+        indexes = [
+            # autofill 의 (own_group, sns_group=None) 조회
+            models.Index(fields=['own_group', 'sns_group']),
+            # detail/all 의 keyset 페이지네이션
+            models.Index(fields=['own_group', 'created_at', 'id']),
+        ]
+
+
+# AccountTombstone
+# 동기화(account/sync) 를 위한 삭제 기록.
+# API 에서 직접 삭제한 객체만 기록하고, CASCADE 로 함께 삭제된 객체는 클라이언트가 같은 규칙으로 정리함.
+class AccountTombstone(models.Model):
+    mwodeola_user = models.ForeignKey(MwodeolaUser, on_delete=models.CASCADE, related_name='account_tombstone')
+
+    object_type = models.SmallIntegerField(choices=TOMBSTONE_TYPE)
+    object_id = models.UUIDField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f'{self.get_object_type_display()}: {self.object_id}'
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['mwodeola_user', 'deleted_at']),
+        ]
+
+
+# AccountSearchIndex
+# group_name, user_id 의 부분 문자열 검색용 인덱스 (accounts/search.py 에서 관리).
+# 소문자로 바꾼 값의 모든 suffix 를 저장하여 '포함' 검색을 (mwodeola_user, field_type, suffix) 인덱스의 범위 검색으로 처리함.
+class AccountSearchIndex(models.Model):
+    mwodeola_user = models.ForeignKey(MwodeolaUser, on_delete=models.CASCADE, related_name='account_search_index')
+    group = models.ForeignKey(AccountGroup, on_delete=models.CASCADE, related_name='search_index_group',
+                              null=True, default=None)
+    detail = models.ForeignKey(AccountDetail, on_delete=models.CASCADE, related_name='search_index_detail',
+                               null=True, default=None)
+
+    field_type = models.SmallIntegerField(choices=SEARCH_FIELD_TYPE)
+    suffix = models.CharField(max_length=100)
+    position = models.SmallIntegerField()
+
+    def __str__(self):
+        return f'{self.get_field_type_display()}: {self.suffix}'
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['mwodeola_user', 'field_type', 'suffix']),
+        ]
@@ -1,11 +1,15 @@
 from collections import OrderedDict
+from itertools import islice
 
-from django.db import IntegrityError
-from django.db.models import Sum
+from django.db import IntegrityError, models
+from django.db.models import Count, IntegerField, OuterRef, QuerySet, Subquery, Sum
+from django.db.models.functions import Coalesce
 from rest_framework import serializers, status
 from rest_framework.utils.serializer_helpers import ReturnDict, BindingDict
 
 from .models import AccountGroup, AccountDetail, Account, SNS, ICON_TYPE
+from .counters import view_counter
+from . import search
 from mwodeola_users.models import MwodeolaUser
 from _mwodeola import exceptions
 from _mwodeola.cipher import AESCipher
@@ -37,6 +41,9 @@ class BaseSerializer(serializers.Serializer):
 
 
 class BaseModelSerializer(serializers.ModelSerializer):
+    # to_representation() 에서 따라가는 관계. list serializer 가 쿼리셋에 자동으로 적용함
+    select_related_fields = ()
+    prefetch_related_fields = ()
 
     def __init__(self, instance=None, data=empty, **kwargs):
         super().__init__(instance, data, **kwargs)
@@ -54,6 +61,14 @@ class BaseModelSerializer(serializers.ModelSerializer):
             # self.results = self.data
             return True
 
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        if cls.select_related_fields:
+            queryset = queryset.select_related(*cls.select_related_fields)
+        if cls.prefetch_related_fields:
+            queryset = queryset.prefetch_related(*cls.prefetch_related_fields)
+        return queryset
+
 
 class SnsSerializer(BaseModelSerializer):
     class Meta:
@@ -63,7 +78,9 @@ class SnsSerializer(BaseModelSerializer):
 
 # [AccountGroup] Serializer
 class AccountGroupSerializerForCreate(BaseModelSerializer):
-    mwodeola_user = serializers.PrimaryKeyRelatedField(queryset=MwodeolaUser.objects.all(), write_only=True)
+    # user 객체를 이미 가진 경우 data 대신 save(mwodeola_user=user) 로 넘겨 조회 쿼리를 생략할 수 있음
+    mwodeola_user = serializers.PrimaryKeyRelatedField(queryset=MwodeolaUser.objects.all(), write_only=True,
+                                                       required=False)
 
     class Meta:
         model = AccountGroup
@@ -76,6 +93,9 @@ class AccountGroupSerializerForCreate(BaseModelSerializer):
         if sns is None and group_name is None:
             raise exceptions.FieldExceptions(group_name='required fields')
 
+        if validated_data.get('mwodeola_user', None) is None:
+            raise exceptions.FieldException(mwodeola_user='required field')
+
         if sns is not None:
             validated_data['group_name'] = sns.name
             validated_data['app_package_name'] = sns.app_package_name
@@ -87,6 +107,7 @@ class AccountGroupSerializerForCreate(BaseModelSerializer):
         except IntegrityError as e:
             raise exceptions.DuplicatedException(group_name=str(e))
 
+        search.index_groups([new_group], replace=False)
         return new_group
 
     def update(self, instance, validated_data):
@@ -95,7 +116,8 @@ class AccountGroupSerializerForCreate(BaseModelSerializer):
 
 # [AccountGroup] Serializer
 class AccountGroupSerializerForUpdate(BaseModelSerializer):
-    mwodeola_user = serializers.PrimaryKeyRelatedField(queryset=MwodeolaUser.objects.all(), write_only=True)
+    mwodeola_user = serializers.PrimaryKeyRelatedField(queryset=MwodeolaUser.objects.all(), write_only=True,
+                                                       required=False)
 
     class Meta:
         model = AccountGroup
@@ -110,32 +132,173 @@ class AccountGroupSerializerForUpdate(BaseModelSerializer):
             validated_data.pop('app_package_name', None)
             validated_data.pop('icon_type', None)
 
+        old_group_name = instance.group_name
+
         try:
             group = super().update(instance, validated_data)
         except IntegrityError as e:
             raise exceptions.DuplicatedException(group_name=str(e))
 
+        if group.group_name != old_group_name:
+            search.index_groups([group])
         return group
 
 
+class BaseListSerializer(serializers.ListSerializer):
+    """
+    prepare() 로 한 묶음의 instance 에 필요한 값(통계, 복호화 등)을 한 번에 계산해
+    context 에 넣어두고, child serializer 는 이를 참조해 instance 마다 쿼리하지 않음.
+    iter_representation() 은 chunk_size 단위로 prepare() 하며 한 행씩 반환함(스트리밍 응답용).
+    context 에 paginator(accounts.pagination.KeysetPaginator) 가 있으면 get_iterable() 이 준비한
+    쿼리셋에서 한 페이지만 조회함.
+    """
+    chunk_size = 100
+
+    def get_iterable(self, data):
+        return data.all() if isinstance(data, models.Manager) else data
+
+    def paginate(self, iterable):
+        paginator = self.context.get('paginator', None)
+        if paginator is None or not isinstance(iterable, QuerySet):
+            return iterable
+        return paginator.paginate(iterable)
+
+    def prepare(self, instances):
+        pass
+
+    def to_representation(self, data):
+        instances = list(self.paginate(self.get_iterable(data)))
+        self.prepare(instances)
+        return [self.child.to_representation(instance) for instance in instances]
+
+    def iter_representation(self, data=None):
+        iterable = self.paginate(self.get_iterable(self.instance if data is None else data))
+        if isinstance(iterable, QuerySet):
+            iterable = iterable.iterator(chunk_size=self.chunk_size)
+
+        iterator = iter(iterable)
+        while True:
+            instances = list(islice(iterator, self.chunk_size))
+            if not instances:
+                break
+            self.prepare(instances)
+            for instance in instances:
+                yield self.child.to_representation(instance)
+
+
+def annotate_group_stats(queryset):
+    # 그룹별 detail_count, total_views 를 서브쿼리로 붙여 목록 전체를 한 번의 쿼리로 조회함
+    detail_count = Account.objects \
+        .filter(own_group=OuterRef('pk')) \
+        .order_by() \
+        .values('own_group') \
+        .annotate(count=Count('id')) \
+        .values('count')
+
+    total_views = AccountDetail.objects \
+        .filter(group=OuterRef('pk')) \
+        .order_by() \
+        .values('group') \
+        .annotate(views=Sum('views')) \
+        .values('views')
+
+    return queryset.annotate(
+        detail_count=Coalesce(Subquery(detail_count, output_field=IntegerField()), 0),
+        total_views=Coalesce(Subquery(total_views, output_field=IntegerField()), 0),
+    )
+
+
+def load_group_stats(group_ids) -> dict:
+    # group_id -> (detail_count, total_views), 그룹 수와 관계없이 두 번의 GROUP BY 쿼리
+    group_ids = set(group_ids)
+    counts = dict.fromkeys(group_ids, 0)
+    views = dict.fromkeys(group_ids, 0)
+
+    if not group_ids:
+        return {}
+
+    rows = Account.objects \
+        .filter(own_group__in=group_ids) \
+        .order_by() \
+        .values_list('own_group') \
+        .annotate(count=Count('id'))
+    for group_id, count in rows:
+        counts[group_id] = count
+
+    rows = AccountDetail.objects \
+        .filter(group__in=group_ids) \
+        .order_by() \
+        .values_list('group') \
+        .annotate(views=Sum('views'))
+    for group_id, views_sum in rows:
+        views[group_id] = views_sum or 0
+
+    return {group_id: (counts[group_id], views[group_id]) for group_id in group_ids}
+
+
+class AccountGroupListSerializer(BaseListSerializer):
+
+    def get_iterable(self, data):
+        iterable = super().get_iterable(data)
+        if isinstance(iterable, QuerySet):
+            iterable = annotate_group_stats(iterable)
+        return iterable
+
+    def prepare(self, groups):
+        self.context['group_stats'] = load_group_stats(
+            group.id for group in groups if not hasattr(group, 'detail_count')
+        )
+
+
 # [AccountGroup] Serializer
 class AccountGroupSerializerForRead(BaseModelSerializer):
     class Meta:
         model = AccountGroup
         exclude = ['mwodeola_user']
+        list_serializer_class = AccountGroupListSerializer
 
     def to_representation(self, instance):
         result = super().to_representation(instance)
+        result['detail_count'], result['total_views'] = self.get_group_stats(instance)
+        return result
 
-        detail_count = Account.objects.filter(own_group=instance.id).count()
-        result['detail_count'] = detail_count
+    def get_group_stats(self, instance):
+        # 1. annotate_group_stats() 로 주입된 값
+        # 2. 상위 list serializer 가 context 에 미리 계산해 둔 값
+        # 3. 단건 조회
+        if hasattr(instance, 'detail_count'):
+            return instance.detail_count, instance.total_views
+
+        group_stats = self.context.get('group_stats', {})
+        if instance.id in group_stats:
+            return group_stats[instance.id]
+
+        return load_group_stats([instance.id])[instance.id]
+
+
+PASSWORD_FIELDS = ('user_password', 'user_password_pin4', 'user_password_pin6', 'user_password_pattern')
 
-        views_sum = AccountDetail.objects.filter(group=instance.id).aggregate(Sum('views'))
-        if views_sum['views__sum'] is None:
-            result['total_views'] = 0
-        else:
-            result['total_views'] = views_sum['views__sum']
-        return result
+
+def encrypt_password_fields(data: dict):
+    encrypted = AESCipher().encrypt_many([data.get(field, None) for field in PASSWORD_FIELDS])
+    data.update(zip(PASSWORD_FIELDS, encrypted))
+    return data
+
+
+def decrypt_password_fields(details) -> dict:
+    # detail.id -> PASSWORD_FIELDS 순서의 복호화 값, 여러 detail 을 한 번의 decrypt_many() 로 처리
+    details = list(details)
+    n = len(PASSWORD_FIELDS)
+    decrypted = AESCipher().decrypt_many([
+        getattr(detail, field) for detail in details for field in PASSWORD_FIELDS
+    ])
+    return {detail.id: decrypted[i * n:(i + 1) * n] for i, detail in enumerate(details)}
+
+
+class AccountDetailListSerializer(BaseListSerializer):
+
+    def prepare(self, details):
+        self.context['passwords'] = decrypt_password_fields(details)
 
 
 # [AccountDetail] Serializer
@@ -144,37 +307,42 @@ class AccountDetailSerializer(BaseModelSerializer):
     class Meta:
         model = AccountDetail
         exclude = ['group']
+        list_serializer_class = AccountDetailListSerializer
+
+    def __init__(self, instance=None, data=empty, **kwargs):
+        super().__init__(instance, data, **kwargs)
+        # create() 에서 함께 만든 Account (응답을 만들 때 다시 조회하지 않도록)
+        self.account = None
 
     def create(self, validated_data):
-        cipher = AESCipher()
-        validated_data['user_password'] = cipher.encrypt(validated_data.get('user_password', None))
-        validated_data['user_password_pin4'] = cipher.encrypt(validated_data.get('user_password_pin4', None))
-        validated_data['user_password_pin6'] = cipher.encrypt(validated_data.get('user_password_pin6', None))
-        validated_data['user_password_pattern'] = cipher.encrypt(validated_data.get('user_password_pattern', None))
+        encrypt_password_fields(validated_data)
 
         new_detail = super().create(validated_data)
-        Account.objects.create(
+        self.account = Account.objects.create(
             own_group=new_detail.group,
             detail=new_detail
         )
+        search.index_details(new_detail.group.mwodeola_user_id, [new_detail], replace=False)
         return new_detail
 
     def update(self, instance, validated_data):
-        cipher = AESCipher()
-        validated_data['user_password'] = cipher.encrypt(validated_data.get('user_password', None))
-        validated_data['user_password_pin4'] = cipher.encrypt(validated_data.get('user_password_pin4', None))
-        validated_data['user_password_pin6'] = cipher.encrypt(validated_data.get('user_password_pin6', None))
-        validated_data['user_password_pattern'] = cipher.encrypt(validated_data.get('user_password_pattern', None))
-        return super().update(instance, validated_data)
+        encrypt_password_fields(validated_data)
+        old_user_id = instance.user_id
+
+        detail = super().update(instance, validated_data)
+
+        if detail.user_id != old_user_id:
+            search.index_details(detail.group.mwodeola_user_id, [detail])
+        return detail
 
     def to_representation(self, instance):
-        cipher = AESCipher()
         result = super().to_representation(instance)
-        result['group'] = instance.group.id
-        result['user_password'] = cipher.decrypt(instance.user_password)
-        result['user_password_pin4'] = cipher.decrypt(instance.user_password_pin4)
-        result['user_password_pin6'] = cipher.decrypt(instance.user_password_pin6)
-        result['user_password_pattern'] = cipher.decrypt(instance.user_password_pattern)
+        result['group'] = instance.group_id
+
+        passwords = self.context.get('passwords', {}).get(instance.id)
+        if passwords is None:
+            passwords = decrypt_password_fields([instance])[instance.id]
+        result.update(zip(PASSWORD_FIELDS, passwords))
         return result
 
 
@@ -186,12 +354,16 @@ class AccountDetailSerializerForRead(BaseModelSerializer):
 
     def to_representation(self, instance):
         ret = super().to_representation(instance)
-        ret['user_password'] = AESCipher().decrypt(instance.user_password)
-        ret['user_password_pin4'] = AESCipher().decrypt(instance.user_password_pin4)
-        ret['user_password_pin6'] = AESCipher().decrypt(instance.user_password_pin6)
-        ret['user_password_pattern'] = AESCipher().decrypt(instance.user_password_pattern)
-        instance.views += 1
-        instance.save()
+
+        # 상위 list serializer 가 한 번에 복호화해 둔 값이 있으면 사용
+        passwords = self.context.get('passwords', {}).get(instance.id)
+        if passwords is None:
+            passwords = decrypt_password_fields([instance])[instance.id]
+        ret.update(zip(PASSWORD_FIELDS, passwords))
+
+        # 조회수는 view_counter 에 모아뒀다가 일괄 반영함 (GET 요청에서 row 를 다시 쓰지 않도록)
+        ret['views'] = instance.views + view_counter.pending(instance.id)
+        view_counter.add(instance.id)
         return ret
 
 
@@ -202,48 +374,80 @@ class AccountDetailSerializerSimple(BaseModelSerializer):
         fields = ['id', 'user_id']
 
 
+class AccountListSerializer(BaseListSerializer):
+
+    def get_iterable(self, data):
+        iterable = super().get_iterable(data)
+        if isinstance(iterable, QuerySet):
+            iterable = self.child.setup_eager_loading(iterable)
+        return iterable
+
+    def prepare(self, accounts):
+        # 중첩된 AccountGroupSerializerForRead 가 계정마다 통계 쿼리를 날리지 않도록 미리 계산
+        group_ids = set()
+        for account in accounts:
+            group_ids.add(account.own_group_id)
+            if account.sns_group_id is not None:
+                group_ids.add(account.sns_group_id)
+        self.context['group_stats'] = load_group_stats(group_ids)
+
+        if isinstance(self.child.fields.get('detail'), AccountDetailSerializerForRead):
+            self.context['passwords'] = decrypt_password_fields(account.detail for account in accounts)
+
+
 # [Account] Serializer
 class AccountSerializerForRead(BaseModelSerializer):
     account_id = serializers.UUIDField(source='id', read_only=True)
+    own_group = AccountGroupSerializerForRead(read_only=True)
+    sns_group = AccountGroupSerializerForRead(read_only=True)
+    detail = AccountDetailSerializerForRead(read_only=True)
+
+    select_related_fields = ('own_group', 'sns_group', 'detail')
 
     class Meta:
         model = Account
         fields = ['account_id', 'created_at', 'own_group', 'sns_group', 'detail']
-
-    def to_representation(self, instance):
-        self.fields['own_group'] = AccountGroupSerializerForRead()
-        self.fields['sns_group'] = AccountGroupSerializerForRead()
-        self.fields['detail'] = AccountDetailSerializerForRead()
-        return super().to_representation(instance)
+        list_serializer_class = AccountListSerializer
 
 
 # [Account] Serializer
 class AccountSerializerSimpleForRead(BaseModelSerializer):
     account_id = serializers.UUIDField(source='id', read_only=True)
+    own_group = AccountGroupSerializerForRead(read_only=True)
+    sns_group = AccountGroupSerializerForRead(read_only=True)
+    detail = AccountDetailSerializerSimple(read_only=True)
+
+    select_related_fields = ('own_group', 'sns_group', 'detail')
 
     class Meta:
         model = Account
         fields = ['account_id', 'created_at', 'own_group', 'sns_group', 'detail']
-
-    def to_representation(self, instance):
-        self.fields['own_group'] = AccountGroupSerializerForRead()
-        self.fields['sns_group'] = AccountGroupSerializerForRead()
-        self.fields['detail'] = AccountDetailSerializerSimple()
-        return super().to_representation(instance)
+        list_serializer_class = AccountListSerializer
 
 
 # [Account] Serializer
 class AccountSerializerSimpleForSearch(BaseModelSerializer):
     account_id = serializers.UUIDField(source='id', read_only=True)
+    own_group = AccountGroupSerializerForRead(read_only=True)
+    detail = AccountDetailSerializerSimple(read_only=True)
+
+    select_related_fields = ('own_group', 'detail')
 
     class Meta:
         model = Account
         fields = ['account_id', 'created_at', 'own_group', 'detail']
+        list_serializer_class = AccountListSerializer
 
-    def to_representation(self, instance):
-        self.fields['own_group'] = AccountGroupSerializerForRead()
-        self.fields['detail'] = AccountDetailSerializerSimple()
-        return super().to_representation(instance)
+
+# [Account] Serializer
+class AccountSerializerForSync(BaseModelSerializer):
+    account_id = serializers.UUIDField(source='id', read_only=True)
+
+    class Meta:
+        model = Account
+        fields = ['account_id', 'created_at', 'own_group', 'sns_group', 'detail']
+        read_only_fields = ['own_group', 'sns_group', 'detail']
+        list_serializer_class = BaseListSerializer
 
 
 # [AccountDetail] Serializer
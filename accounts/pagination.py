@@ -0,0 +1,111 @@
+import base64
+import binascii
+import json
+from functools import reduce
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+from _mwodeola import exceptions
+
+
+PAGE_SIZE_DEFAULT = 100
+PAGE_SIZE = getattr(settings, "ACCOUNT_PAGE_SIZE", PAGE_SIZE_DEFAULT)
+
+PAGE_SIZE_MAX_DEFAULT = 500
+PAGE_SIZE_MAX = getattr(settings, "ACCOUNT_PAGE_SIZE_MAX", PAGE_SIZE_MAX_DEFAULT)
+
+NEXT_CURSOR_HEADER = 'X-Next-Cursor'
+
+
+class KeysetPaginator:
+    """
+    목록 조회용 keyset(cursor) 페이지네이션. OFFSET 없이 마지막 행의 정렬 키 다음부터 조회함.
+
+    요청에 cursor 또는 page_size 가 있을 때만 적용되며(from_request), 응답 body 는 그대로 배열이고
+    다음 페이지가 있으면 X-Next-Cursor 헤더로 cursor 를 내려줌. 헤더가 없으면 마지막 페이지.
+
+        GET account/group?page_size=50
+        GET account/group?page_size=50&cursor=<X-Next-Cursor>
+
+    ordering 의 마지막 필드는 유일해야 함(기본값 ('created_at', 'id')).
+    """
+    ordering = ('created_at', 'id')
+
+    def __init__(self, cursor=None, page_size=PAGE_SIZE, ordering=None):
+        if ordering is not None:
+            self.ordering = ordering
+        self.cursor = cursor
+        self.page_size = page_size
+        self.next_cursor = None
+
+    @classmethod
+    def from_request(cls, request, **kwargs):
+        cursor = request.GET.get('cursor', None)
+        page_size = request.GET.get('page_size', None)
+
+        if cursor is None and page_size is None:
+            return None
+
+        if page_size is None:
+            page_size = PAGE_SIZE
+        else:
+            try:
+                page_size = int(page_size)
+            except ValueError:
+                raise exceptions.FieldException(page_size='A valid integer is required')
+            if page_size < 1:
+                raise exceptions.FieldException(page_size='Ensure this value is greater than or equal to 1')
+
+        return cls(cursor=cursor or None, page_size=min(page_size, PAGE_SIZE_MAX), **kwargs)
+
+    def page_queryset(self, queryset):
+        # 한 행을 더 조회해 다음 페이지가 있는지 확인
+        queryset = queryset.order_by(*self.ordering)
+
+        if self.cursor is not None:
+            try:
+                queryset = queryset.filter(self._after(self.decode_cursor(self.cursor)))
+            except ValidationError:
+                raise exceptions.FieldException(cursor='Invalid cursor')
+
+        return queryset[:self.page_size + 1]
+
+    def paginate(self, queryset) -> list:
+        page = list(self.page_queryset(queryset))
+
+        if len(page) > self.page_size:
+            page = page[:self.page_size]
+            self.next_cursor = self.encode_cursor(self._get_key(page[-1]))
+        else:
+            self.next_cursor = None
+
+        return page
+
+    def _after(self, key) -> Q:
+        # (a, b, c) > (x, y, z)  ->  a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z)
+        conditions = []
+        for i, field in enumerate(self.ordering):
+            equals = {self.ordering[j]: key[j] for j in range(i)}
+            conditions.append(Q(**equals, **{f'{field}__gt': key[i]}))
+        return reduce(lambda a, b: a | b, conditions)
+
+    def _get_key(self, item):
+        if isinstance(item, dict):
+            return [item[field] for field in self.ordering]
+        return [getattr(item, field) for field in self.ordering]
+
+    def encode_cursor(self, key) -> str:
+        value = json.dumps([str(x) for x in key], separators=(',', ':'))
+        return base64.urlsafe_b64encode(value.encode()).decode()
+
+    def decode_cursor(self, cursor) -> list:
+        try:
+            key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except (binascii.Error, UnicodeError, ValueError):
+            raise exceptions.FieldException(cursor='Invalid cursor')
+
+        if not isinstance(key, list) or len(key) != len(self.ordering):
+            raise exceptions.FieldException(cursor='Invalid cursor')
+        return key
@@ -0,0 +1,87 @@
+from django.db.models import Q
+
+from .models import AccountGroup, AccountDetail, Account, AccountTombstone
+
+
+# account endpoint 들의 조회 쿼리.
+# serializer/view 와 audit_query_plans 커맨드가 같은 함수를 쓰므로 조회 조건은 여기서만 바꿈.
+
+def get_groups(user_id):
+    return AccountGroup.objects.filter(mwodeola_user=user_id)
+
+
+def get_details(user_id):
+    return AccountDetail.objects.filter(group__mwodeola_user=user_id)
+
+
+def get_accounts(user_id):
+    return Account.objects.filter(own_group__mwodeola_user=user_id)
+
+
+def get_group_accounts(group_id):
+    return Account.objects.filter(own_group=group_id)
+
+
+def get_orphan_groups(user_id):
+    # account 가 하나도 없는 group (anti-join)
+    return get_groups(user_id).filter(account_own_group__isnull=True)
+
+
+def get_sns_groups(user_id):
+    return get_groups(user_id).filter(~Q(sns=None))
+
+
+def get_user_ids(user_id):
+    return get_details(user_id) \
+        .exclude(user_id=None) \
+        .values('user_id') \
+        .distinct()
+
+
+def get_autofill_groups(user_id, app_package_name):
+    return get_groups(user_id).filter(app_package_name=app_package_name)
+
+
+def get_autofill_accounts(group_ids):
+    return Account.objects.filter(own_group__in=group_ids, sns_group=None)
+
+
+def get_autofill_detail(group, user_id):
+    return AccountDetail.objects.filter(group=group, user_id=user_id)
+
+
+def get_detail_views(detail_ids):
+    return AccountDetail.objects.filter(id__in=detail_ids).values_list('id', 'views')
+
+
+def get_sync_querysets(user_id, since=None):
+    """
+    since 이후 생성/수정/삭제된 (groups, details, accounts, tombstones). since 가 None 이면 전체(tombstone 제외).
+    """
+    groups = get_groups(user_id)
+    details = get_details(user_id)
+    accounts = get_accounts(user_id)
+
+    if since is None:
+        return groups, details, accounts, AccountTombstone.objects.none()
+
+    details = details.filter(Q(created_at__gt=since) | Q(last_confirmed_at__gt=since))
+    accounts = accounts.filter(created_at__gt=since)
+    # detail_count, total_views 가 바뀐 group 도 함께 내려줌
+    groups = groups.filter(
+        Q(updated_at__gt=since) |
+        Q(id__in=details.values('group')) |
+        Q(id__in=accounts.values('own_group'))
+    )
+    tombstones = AccountTombstone.objects \
+        .filter(mwodeola_user=user_id) \
+        .filter(deleted_at__gt=since)
+    return groups, details, accounts, tombstones
+
+
+def get_export_querysets(user_id):
+    return (
+        get_groups(user_id).order_by('created_at'),
+        get_details(user_id).order_by('created_at'),
+        get_accounts(user_id).order_by('created_at'),
+    )
@@ -0,0 +1,83 @@
+from django.db.models import OuterRef, Subquery
+
+from .models import (
+    AccountGroup, Account, AccountSearchIndex,
+    SEARCH_GROUP_NAME, SEARCH_USER_ID,
+)
+
+# 어떤 suffix 보다도 뒤에 정렬되는 문자: suffix 가 keyword 로 시작하는지를 범위 조건으로 검사함
+MAX_CHAR = '\U0010ffff'
+
+
+def make_suffixes(value):
+    if value is None:
+        return []
+    value = value.lower()
+    return [(value[i:], i) for i in range(len(value))]
+
+
+def index_groups(groups, replace=True):
+    # replace=False: 새로 만든 group 이라 지울 색인이 없음
+    groups = list(groups)
+    if replace:
+        AccountSearchIndex.objects \
+            .filter(group__in=[group.id for group in groups], field_type=SEARCH_GROUP_NAME) \
+            .delete()
+    AccountSearchIndex.objects.bulk_create([
+        AccountSearchIndex(
+            mwodeola_user_id=group.mwodeola_user_id,
+            group_id=group.id,
+            field_type=SEARCH_GROUP_NAME,
+            suffix=suffix,
+            position=position,
+        )
+        for group in groups
+        for suffix, position in make_suffixes(group.group_name)
+    ])
+
+
+def index_details(user_id, details, replace=True):
+    details = list(details)
+    if replace:
+        AccountSearchIndex.objects \
+            .filter(detail__in=[detail.id for detail in details], field_type=SEARCH_USER_ID) \
+            .delete()
+    AccountSearchIndex.objects.bulk_create([
+        AccountSearchIndex(
+            mwodeola_user_id=user_id,
+            detail_id=detail.id,
+            field_type=SEARCH_USER_ID,
+            suffix=suffix,
+            position=position,
+        )
+        for detail in details
+        for suffix, position in make_suffixes(detail.user_id)
+    ])
+
+
+def match(user_id, field_type, keyword):
+    keyword = keyword.lower()
+    return AccountSearchIndex.objects \
+        .filter(mwodeola_user=user_id, field_type=field_type) \
+        .filter(suffix__gte=keyword, suffix__lt=keyword + MAX_CHAR)
+
+
+def search_groups(user_id, group_name):
+    # 일치 위치가 앞일수록(접두 일치 우선) 먼저 정렬
+    matches = match(user_id, SEARCH_GROUP_NAME, group_name)
+    rank = matches.filter(group=OuterRef('pk')).order_by('position').values('position')[:1]
+
+    return AccountGroup.objects \
+        .filter(id__in=matches.values('group')) \
+        .annotate(search_rank=Subquery(rank)) \
+        .order_by('search_rank', 'group_name')
+
+
+def search_accounts_by_user_id(user_id, keyword):
+    matches = match(user_id, SEARCH_USER_ID, keyword)
+    rank = matches.filter(detail=OuterRef('detail')).order_by('position').values('position')[:1]
+
+    return Account.objects \
+        .filter(detail__in=matches.values('detail')) \
+        .annotate(search_rank=Subquery(rank)) \
+        .order_by('search_rank', 'detail__user_id', 'created_at')
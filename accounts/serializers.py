@@ -1,6 +1,8 @@
 import datetime
-from django.db import IntegrityError
-from django.db.models import Q
+import uuid
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
 from django.forms.models import model_to_dict
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
 from django.utils.translation import gettext_lazy as _
@@ -10,7 +12,15 @@ from rest_framework.fields import empty
 from _mwodeola import exceptions
 from _mwodeola.cipher import AESCipher
 from mwodeola_users.models import MwodeolaUser
-from .models import SNS, AccountGroup, AccountDetail, Account
+from .models import (
+    SNS, AccountGroup, AccountDetail, Account,
+    TOMBSTONE_GROUP, TOMBSTONE_DETAIL, TOMBSTONE_ACCOUNT,
+)
+from .utils import add_tombstones
+from .caches import autofill_cache
+from .fields import UserPrimaryKeyRelatedField
+from .counters import view_counter
+from . import search, queries
 from .models_serializers import (
     AccountGroupSerializerForRead,
     AccountGroupSerializerForCreate,
@@ -21,19 +31,44 @@ from .models_serializers import (
     AccountSerializerForRead,
     AccountSerializerSimpleForRead,
     AccountSerializerSimpleForSearch,
+    AccountSerializerForSync,
+    annotate_group_stats,
 )
 
 
+SYNC_CURSOR_OVERLAP = datetime.timedelta(seconds=5)
+
+IMPORT_LIMIT_DEFAULT = 1000
+IMPORT_LIMIT = getattr(settings, "ACCOUNT_IMPORT_LIMIT", IMPORT_LIMIT_DEFAULT)
+
+
 class BaseSerializer(serializers.Serializer):
 
     def __init__(self, user=None, instance=None, data=empty, **kwargs):
         self.user = user
         self.results = {}
+        self.results_serializer = None
         self.err_messages = {}
         self.err_status = status.HTTP_400_BAD_REQUEST
 
         super().__init__(instance, data, **kwargs)
 
+    @property
+    def results(self):
+        # 목록 결과는 many=True serializer 로 들고 있다가 필요할 때 만듦 (스트리밍 응답은 iter_results())
+        if self.results_serializer is not None:
+            return self.results_serializer.data
+        return self._results
+
+    @results.setter
+    def results(self, value):
+        self._results = value
+
+    def iter_results(self):
+        if self.results_serializer is not None:
+            return self.results_serializer.iter_representation()
+        return iter(self.results)
+
     def is_valid(self, raise_exception=False):
         if not super().is_valid(raise_exception):
             self.err_messages['message'] = 'Field error'
@@ -66,56 +101,45 @@ class AccountGroup_PUT_Serializer(AccountGroupSerializerForUpdate):
         except IntegrityError as e:
             raise exceptions.DuplicatedException(group_name=str(e))
 
+        autofill_cache.invalidate(ret.mwodeola_user_id)
         self.results = AccountGroupSerializerForRead(ret).data
         return ret
 
 
 class AccountGroup_DELETE_Serializer(BaseSerializer):
-    account_group_ids = serializers.ListField(
-        child=serializers.PrimaryKeyRelatedField(queryset=AccountGroup.objects.all()),
+    account_group_ids = UserPrimaryKeyRelatedField(
+        queryset=AccountGroup.objects.all(),
+        many=True,
         allow_empty=True
     )
 
-    def is_valid(self, raise_exception=False):
-        if not super().is_valid(raise_exception):
-            return False
-
+    def delete(self):
         groups = self.validated_data['account_group_ids']
 
-        for group in groups:
-            if group.mwodeola_user.id != self.user.id:
-                raise exceptions.NotOwnerDataException()
+        deleted_group_ids = [group.id for group in groups]
+        is_deleted_sns_group = any(group.sns_id is not None for group in groups)
 
-        return True
+        with transaction.atomic():
+            # 선택한 group 들을 한 번에 삭제 (CASCADE 포함)
+            AccountGroup.objects.filter(id__in=deleted_group_ids).delete()
 
-    def delete(self):
-        is_deleted_sns_group = False
+            # sns group 이 삭제된 경우,
+            # 이와 연결된 그룹들 중 account 갯수가 0이 된 그룹을 찾아 제거함 (account 가 없는 group 을 한 번의 쿼리로 조회)
+            if is_deleted_sns_group:
+                orphan_group_ids = list(queries.get_orphan_groups(self.user.id).values_list('id', flat=True))
+                if orphan_group_ids:
+                    AccountGroup.objects.filter(id__in=orphan_group_ids).delete()
+                    deleted_group_ids.extend(orphan_group_ids)
 
-        groups = self.validated_data['account_group_ids']
-        for group in groups:
-            if group.sns is not None:
-                is_deleted_sns_group = True
+            add_tombstones(self.user.id, TOMBSTONE_GROUP, deleted_group_ids)
 
-            group.delete()
-
-        # sns group 이 삭제된 경우,
-        # 이와 연결된 그룹들 중 account 갯수가 0이 된 그룹을 찾아 제거함
-        if is_deleted_sns_group:
-            all_groups = AccountGroup.objects.filter(mwodeola_user=self.user.id)
-
-            for group in all_groups:
-                account_count = Account.objects.filter(own_group=group.id).count()
-                if account_count == 0:
-                    group.delete()
+        autofill_cache.invalidate(self.user.id)
 
 
 class AccountGroupSnsSerializer(BaseSerializer):
 
     def is_valid(self, raise_exception=False):
-        q = Q(mwodeola_user=self.user.id)
-        q.add(~Q(sns=None), q.AND)
-
-        sns_groups = AccountGroup.objects.filter(q)
+        sns_groups = queries.get_sns_groups(self.user.id)
 
         serializer = AccountGroupSerializerForRead(sns_groups, many=True)
 
@@ -124,30 +148,23 @@ class AccountGroupSnsSerializer(BaseSerializer):
 
 
 class AccountGroupFavorite_PUT_Serializer(BaseSerializer):
-    account_group_id = serializers.PrimaryKeyRelatedField(queryset=AccountGroup.objects.all())
+    account_group_id = UserPrimaryKeyRelatedField(queryset=AccountGroup.objects.all())
     is_favorite = serializers.BooleanField()
 
-    def is_valid(self, raise_exception=False):
-        if not super().is_valid(raise_exception):
-            return False
-
-        account_group = self.validated_data['account_group_id']
-
-        if account_group.mwodeola_user.id != self.user.id:
-            raise exceptions.NotOwnerDataException()
-
-        return True
-
     def create(self, validated_data):
         group = validated_data['account_group_id']
         is_favorite = validated_data['is_favorite']
         group.is_favorite = is_favorite
         group.save()
+        autofill_cache.invalidate(self.user.id)
         return group
 
 
 class AccountGroupDetail_GET_Serializer(BaseSerializer):
-    account_id = serializers.PrimaryKeyRelatedField(queryset=Account.objects.all())
+    account_id = UserPrimaryKeyRelatedField(
+        queryset=AccountSerializerForRead.setup_eager_loading(Account.objects.all()),
+        user_field='own_group__mwodeola_user'
+    )
 
     def is_valid(self, raise_exception=False):
         if not super().is_valid(raise_exception):
@@ -155,9 +172,6 @@ class AccountGroupDetail_GET_Serializer(BaseSerializer):
 
         account = self.validated_data['account_id']
 
-        if account.own_group.mwodeola_user.id != self.user.id:
-            raise exceptions.NotOwnerDataException()
-
         # SNS 그룹에 연결된 detail 의 요청은 views 를 올리지 않음.
         # if account.sns_group is None:
         #     account.detail.views += 1
@@ -185,7 +199,8 @@ class AccountGroupDetail_POST_Serializer(BaseSerializer):
             return False
 
         own_group = self.validated_data['own_group']
-        own_group['mwodeola_user'] = self.user.id
+        # user 는 save() 에서 객체로 넘김 (PrimaryKeyRelatedField 의 user 조회 쿼리 생략)
+        own_group.pop('mwodeola_user', None)
 
         # Android Retrofit2 의 gson 변환시 Int 타입의 null 값은 0으로 대입 되기 때문.
         sns = own_group.get('sns', None)
@@ -208,9 +223,15 @@ class AccountGroupDetail_POST_Serializer(BaseSerializer):
         return True
 
     def save(self, **kwargs):
-        new_group = self.group_serializer.save()
-        new_detail = self.detail_serializer.save(group=new_group)
-        new_account = Account.objects.get(own_group=new_group)
+        with transaction.atomic():
+            new_group = self.group_serializer.save(mwodeola_user=self.user)
+            new_detail = self.detail_serializer.save(group=new_group)
+        new_account = self.detail_serializer.account
+        autofill_cache.invalidate(self.user.id)
+
+        # 방금 만든 group 의 통계는 이미 알고 있으므로 다시 조회하지 않음
+        new_group.detail_count = 1
+        new_group.total_views = new_detail.views
 
         self.results = {
             'account_id': new_account.id,
@@ -232,13 +253,14 @@ class AccountGroupDetail_PUT_Serializer(BaseSerializer):
 
         self.group_serializer = None
         self.detail_serializer = None
+        self.account = None
 
     def is_valid(self, raise_exception=False):
         if not super().is_valid(raise_exception):
             return False
 
         own_group = self.validated_data['own_group']
-        own_group['mwodeola_user'] = self.user.id
+        own_group.pop('mwodeola_user', None)
         detail = self.validated_data['detail']
 
         group_id = own_group.get('id', None)
@@ -249,21 +271,24 @@ class AccountGroupDetail_PUT_Serializer(BaseSerializer):
         if detail_id is None:
             raise exceptions.FieldException(id='required field')
 
+        # 소유자 조건을 쿼리에 포함 (다른 user 의 객체는 없는 객체로 처리)
+        # 수정으로 바뀌지 않는 group 통계(detail_count, total_views)를 함께 조회
         try:
-            group_instance = AccountGroup.objects.get(id=group_id)
+            group_instance = annotate_group_stats(queries.get_groups(self.user.id)).get(id=group_id)
         except (ValidationError, ObjectDoesNotExist) as e:
             raise exceptions.FieldException(id=str(e))
 
         try:
-            detail_instance = AccountDetail.objects.get(id=detail_id)
+            detail_instance = queries.get_details(self.user.id).select_related('group').get(id=detail_id)
         except (ValidationError, ObjectDoesNotExist) as e:
             raise exceptions.FieldException(id=str(e))
 
-        if group_instance.mwodeola_user.id != self.user.id:
-            raise exceptions.NotOwnerDataException()
-
-        if detail_instance.group.mwodeola_user.id != self.user.id:
-            raise exceptions.NotOwnerDataException()
+        self.account = queries.get_group_accounts(group_instance) \
+            .select_related('sns_group') \
+            .filter(detail=detail_instance) \
+            .first()
+        if self.account is None:
+            raise exceptions.FieldException(id='detail is not in the group')
 
         self.group_serializer = AccountGroupSerializerForUpdate(group_instance, data=own_group)
         self.detail_serializer = AccountDetailSerializer(detail_instance, data=detail)
@@ -279,15 +304,21 @@ class AccountGroupDetail_PUT_Serializer(BaseSerializer):
         return True
 
     def save(self, **kwargs):
-        group = self.group_serializer.save()
-        detail = self.detail_serializer.save()
-        account = Account.objects.filter(own_group=group).filter(detail=detail)
+        with transaction.atomic():
+            group = self.group_serializer.save()
+            detail = self.detail_serializer.save()
+        account = self.account
+        autofill_cache.invalidate(self.user.id)
+
+        sns_group = None
+        if account.sns_group is not None:
+            sns_group = AccountGroupSerializerForRead(account.sns_group).data
 
         self.results = {
-            'account_id': account[0].id,
-            'created_at': account[0].created_at,
+            'account_id': account.id,
+            'created_at': account.created_at,
             'own_group': AccountGroupSerializerForRead(group).data,
-            'sns_group': account[0].sns_group,
+            'sns_group': sns_group,
             'detail': AccountDetailSerializerForRead(detail).data
         }
 
@@ -296,7 +327,11 @@ class AccountGroupDetail_PUT_Serializer(BaseSerializer):
 
 class AccountGroupSnsDetail_POST_Serializer(BaseSerializer):
     own_group = serializers.DictField()
-    sns_detail_id = serializers.PrimaryKeyRelatedField(queryset=AccountDetail.objects.all())
+    sns_detail_id = UserPrimaryKeyRelatedField(
+        queryset=AccountDetail.objects.all(),
+        user_field='group__mwodeola_user',
+        select_related=('group',)
+    )
 
     def __init__(self, user=None, instance=None, data=empty, **kwargs):
         super().__init__(user, instance, data, **kwargs)
@@ -312,10 +347,7 @@ class AccountGroupSnsDetail_POST_Serializer(BaseSerializer):
 
         sns_detail = self.validated_data['sns_detail_id']
 
-        if sns_detail.group.mwodeola_user.id != self.user.id:
-            raise exceptions.NotOwnerDataException()
-
-        if sns_detail.group.sns is None:
+        if sns_detail.group.sns_id is None:
             raise exceptions.FieldException(sns_detail_id='This detail is not belong to SNS group')
 
         self.serializer = AccountGroupSerializerForCreate(data=own_group)
@@ -337,6 +369,7 @@ class AccountGroupSnsDetail_POST_Serializer(BaseSerializer):
             sns_group=sns_detail.group,
             detail=sns_detail
         )
+        autofill_cache.invalidate(self.user.id)
 
         own_group_dict = AccountGroupSerializerForRead(new_group).data
         sns_group_dict = AccountGroupSerializerForRead(sns_detail.group).data
@@ -354,8 +387,12 @@ class AccountGroupSnsDetail_POST_Serializer(BaseSerializer):
 
 
 class AccountGroupSnsDetail_PUT_Serializer(BaseSerializer):
-    account_group_id = serializers.PrimaryKeyRelatedField(queryset=AccountGroup.objects.all())
-    sns_detail_id = serializers.PrimaryKeyRelatedField(queryset=AccountDetail.objects.all())
+    account_group_id = UserPrimaryKeyRelatedField(queryset=AccountGroup.objects.all())
+    sns_detail_id = UserPrimaryKeyRelatedField(
+        queryset=AccountDetail.objects.all(),
+        user_field='group__mwodeola_user',
+        select_related=('group',)
+    )
 
     def is_valid(self, raise_exception=False):
         if not super().is_valid(raise_exception):
@@ -364,16 +401,13 @@ class AccountGroupSnsDetail_PUT_Serializer(BaseSerializer):
         account_group = self.validated_data['account_group_id']
         sns_detail = self.validated_data['sns_detail_id']
 
-        if account_group.mwodeola_user.id != self.user.id or sns_detail.group.mwodeola_user.id != self.user.id:
-            raise exceptions.NotOwnerDataException()
-
-        if account_group.sns is not None:
+        if account_group.sns_id is not None:
             self.err_messages['message'] = 'account_group must be no sns'
             self.err_messages['code'] = 'sns_error_1'
             self.err_status = status.HTTP_400_BAD_REQUEST
             return False
 
-        if sns_detail.group.sns is None:
+        if sns_detail.group.sns_id is None:
             self.err_messages['message'] = 'sns_detail must be sns'
             self.err_messages['code'] = 'sns_error_2'
             self.err_status = status.HTTP_400_BAD_REQUEST
@@ -394,6 +428,8 @@ class AccountGroupSnsDetail_PUT_Serializer(BaseSerializer):
         except IntegrityError as e:
             raise exceptions.DuplicatedException(sns_detail_id=str(e))
 
+        autofill_cache.invalidate(self.user.id)
+
         own_group_dict = AccountGroupSerializerForRead(own_group).data
         sns_group_dict = AccountGroupSerializerForRead(sns_detail.group).data
         sns_detail_dict = AccountDetailSerializerForRead(sns_detail).data
@@ -410,7 +446,11 @@ class AccountGroupSnsDetail_PUT_Serializer(BaseSerializer):
 
 
 class AccountGroupSnsDetail_DELETE_Serializer(BaseSerializer):
-    account_id = serializers.PrimaryKeyRelatedField(queryset=Account.objects.all())
+    account_id = UserPrimaryKeyRelatedField(
+        queryset=Account.objects.all(),
+        user_field='own_group__mwodeola_user',
+        select_related=('own_group',)
+    )
 
     def is_valid(self, raise_exception=False):
         if not super().is_valid(raise_exception):
@@ -418,10 +458,7 @@ class AccountGroupSnsDetail_DELETE_Serializer(BaseSerializer):
 
         account = self.validated_data['account_id']
 
-        if account.own_group.mwodeola_user.id != self.user.id:
-            raise exceptions.NotOwnerDataException()
-
-        if Account.objects.filter(own_group=account.own_group).count() == 1:
+        if queries.get_group_accounts(account.own_group_id).count() == 1:
             self.instance = account.own_group
         else:
             self.instance = account
@@ -429,11 +466,16 @@ class AccountGroupSnsDetail_DELETE_Serializer(BaseSerializer):
         return True
 
     def delete(self):
+        if isinstance(self.instance, AccountGroup):
+            add_tombstones(self.user.id, TOMBSTONE_GROUP, [self.instance.id])
+        else:
+            add_tombstones(self.user.id, TOMBSTONE_ACCOUNT, [self.instance.id])
         self.instance.delete()
+        autofill_cache.invalidate(self.user.id)
 
 
 class AccountGroupDetailAllSerializer(BaseSerializer):
-    account_group_id = serializers.PrimaryKeyRelatedField(queryset=AccountGroup.objects.all())
+    account_group_id = UserPrimaryKeyRelatedField(queryset=AccountGroup.objects.all())
 
     def is_valid(self, raise_exception=False):
         if not super().is_valid(raise_exception):
@@ -441,19 +483,15 @@ class AccountGroupDetailAllSerializer(BaseSerializer):
 
         account_group = self.validated_data['account_group_id']
 
-        if account_group.mwodeola_user.id != self.user.id:
-            raise exceptions.NotOwnerDataException()
+        accounts = queries.get_group_accounts(account_group)
 
-        accounts = Account.objects.filter(own_group=account_group)
-
-        serializer = AccountSerializerForRead(accounts, many=True)
-        self.results = serializer.data
+        self.results_serializer = AccountSerializerForRead(accounts, many=True, context=self.context)
 
         return True
 
 
 class AccountGroupDetailAllSimpleSerializer(BaseSerializer):
-    account_group_id = serializers.PrimaryKeyRelatedField(queryset=AccountGroup.objects.all())
+    account_group_id = UserPrimaryKeyRelatedField(queryset=AccountGroup.objects.all())
 
     def is_valid(self, raise_exception=False):
         if not super().is_valid(raise_exception):
@@ -461,19 +499,16 @@ class AccountGroupDetailAllSimpleSerializer(BaseSerializer):
 
         account_group = self.validated_data['account_group_id']
 
-        if account_group.mwodeola_user.id != self.user.id:
-            raise exceptions.NotOwnerDataException()
-
-        accounts = Account.objects.filter(own_group=account_group)
+        accounts = queries.get_group_accounts(account_group)
 
-        serializer = AccountSerializerSimpleForRead(accounts, many=True)
+        serializer = AccountSerializerSimpleForRead(accounts, many=True, context=self.context)
         self.results = serializer.data
 
         return True
 
 
 class AccountDetail_POST_Serializer(AccountDetailSerializer):
-    group = serializers.PrimaryKeyRelatedField(queryset=AccountGroup.objects.all(), write_only=True)
+    group = UserPrimaryKeyRelatedField(queryset=AccountGroup.objects.all(), write_only=True)
 
     class Meta:
         model = AccountDetail
@@ -492,17 +527,13 @@ class AccountDetail_POST_Serializer(AccountDetailSerializer):
         if not super().is_valid(raise_exception):
             return False
 
-        group = self.validated_data['group']
-
-        if group.mwodeola_user.id != self.user.id:
-            raise exceptions.NotOwnerDataException()
-
         return True
 
     def create(self, validated_data):
         new_detail = super().create(validated_data)
 
         new_account = Account.objects.get(detail=new_detail)
+        autofill_cache.invalidate(self.user.id)
 
         own_group_dict = AccountGroupSerializerForRead(new_account.own_group).data
         detail_dict = AccountDetailSerializerForRead(new_detail).data
@@ -519,29 +550,26 @@ class AccountDetail_POST_Serializer(AccountDetailSerializer):
 
 
 class AccountDetail_DELETE_Serializer(BaseSerializer):
-    account_detail_id = serializers.PrimaryKeyRelatedField(queryset=AccountDetail.objects.all())
-
-    def is_valid(self, raise_exception=False):
-        if not super().is_valid(raise_exception):
-            return False
-
-        account_detail = self.validated_data['account_detail_id']
-
-        if account_detail.group.mwodeola_user.id != self.user.id:
-            raise exceptions.NotOwnerDataException()
-
-        return True
+    account_detail_id = UserPrimaryKeyRelatedField(
+        queryset=AccountDetail.objects.all(),
+        user_field='group__mwodeola_user',
+        select_related=('group',)
+    )
 
     def delete(self):
         account_detail = self.validated_data['account_detail_id']
 
-        accounts = Account.objects.filter(own_group=account_detail.group)
+        accounts = queries.get_group_accounts(account_detail.group_id)
 
         if len(accounts) == 1:
+            add_tombstones(self.user.id, TOMBSTONE_GROUP, [account_detail.group.id])
             account_detail.group.delete()
         else:
+            add_tombstones(self.user.id, TOMBSTONE_DETAIL, [account_detail.id])
             account_detail.delete()
 
+        autofill_cache.invalidate(self.user.id)
+
 
 class AccountSearchGroupSerializer(BaseSerializer):
     group_name = serializers.CharField(max_length=30)
@@ -552,11 +580,9 @@ class AccountSearchGroupSerializer(BaseSerializer):
 
         group_name = self.validated_data['group_name']
 
-        groups = AccountGroup.objects\
-            .filter(mwodeola_user=self.user)\
-            .filter(group_name__contains=group_name)
+        groups = search.search_groups(self.user.id, group_name)
 
-        serializer = AccountGroupSerializerForRead(groups, many=True)
+        serializer = AccountGroupSerializerForRead(groups, many=True, context=self.context)
 
         self.results = serializer.data
         return True
@@ -571,15 +597,9 @@ class AccountSearchDetailSerializer(BaseSerializer):
 
         user_id = self.validated_data['user_id']
 
-        details = AccountDetail.objects.filter(user_id__contains=user_id)
-        detail_ids = []
-        for detail in details:
-            if detail.group.mwodeola_user.id == self.user.id:
-                detail_ids.append(detail.id)
-
-        accounts = Account.objects.filter(detail__in=detail_ids)
+        accounts = search.search_accounts_by_user_id(self.user.id, user_id)
 
-        serializer = AccountSerializerSimpleForSearch(accounts, many=True)
+        serializer = AccountSerializerSimpleForSearch(accounts, many=True, context=self.context)
 
         self.results = serializer.data
         return True
@@ -589,21 +609,233 @@ class AccountUserIdsSerializer(BaseSerializer):
 
     def is_valid(self, raise_exception=False):
 
-        groups = AccountGroup.objects.filter(mwodeola_user=self.user.id)
-        group_ids = []
-        for group in groups:
-            group_ids.append(group.id)
+        user_ids = queries.get_user_ids(self.user.id)
 
-        details = AccountDetail.objects.filter(group__in=group_ids)
-        id_set = set()
-        for detail in details:
-            if detail.user_id is not None:
-                id_set.add(detail.user_id)
+        paginator = self.context.get('paginator', None)
+        if paginator is not None:
+            user_ids = paginator.paginate(user_ids)
 
-        self.results = list(id_set)
+        self.results = [row['user_id'] for row in user_ids]
         return True
 
 
+class AccountSyncSerializer(BaseSerializer):
+    """
+    cursor 이후 생성/수정/삭제된 group, detail, account 만 반환함 (cursor 가 없으면 전체).
+    응답의 cursor 를 다음 요청에 그대로 전달하면 됨.
+
+    deleted 에는 API 로 직접 삭제한 객체만 포함되므로, 클라이언트는 서버와 같은 CASCADE 규칙으로
+    삭제된 group 의 detail/account, 삭제된 detail 을 참조하는 account 를 함께 정리해야 함.
+    """
+    cursor = serializers.DateTimeField(required=False, allow_null=True, default=None)
+
+    def is_valid(self, raise_exception=False):
+        if not super().is_valid(raise_exception):
+            return False
+
+        # 조회 도중 커밋된 변경을 놓치지 않도록 다음 cursor 는 조회 전에 정하고,
+        # 이전 cursor 는 SYNC_CURSOR_OVERLAP 만큼 겹쳐서 조회함 (중복 전달은 클라이언트에서 덮어쓰면 됨)
+        next_cursor = timezone.now()
+        cursor = self.validated_data['cursor']
+
+        since = None if cursor is None else cursor - SYNC_CURSOR_OVERLAP
+        groups, details, accounts, tombstones = queries.get_sync_querysets(self.user.id, since)
+
+        deleted = {'groups': [], 'details': [], 'accounts': []}
+        deleted_keys = {TOMBSTONE_GROUP: 'groups', TOMBSTONE_DETAIL: 'details', TOMBSTONE_ACCOUNT: 'accounts'}
+        for object_type, object_id in tombstones.values_list('object_type', 'object_id'):
+            deleted[deleted_keys[object_type]].append(object_id)
+
+        self.results = {
+            'cursor': serializers.DateTimeField().to_representation(next_cursor),
+            'groups': AccountGroupSerializerForRead(groups, many=True).data,
+            'details': AccountDetailSerializer(details, many=True).data,
+            'accounts': AccountSerializerForSync(accounts, many=True).data,
+            'deleted': deleted,
+        }
+        return True
+
+
+class AccountImportItemSerializer(serializers.Serializer):
+    group_name = serializers.CharField(max_length=30)
+    app_package_name = serializers.CharField(max_length=100, allow_null=True, required=False, default=None)
+    web_url = serializers.URLField(max_length=100, allow_null=True, required=False, default=None)
+    user_id = serializers.CharField(max_length=100, allow_null=True, required=False, default=None)
+    user_password = serializers.CharField(max_length=255, allow_null=True, required=False, default=None)
+    memo = serializers.CharField(max_length=2000, allow_null=True, required=False, default=None)
+
+    def to_internal_value(self, data):
+        # CSV 의 빈 칸은 None 으로 처리
+        if isinstance(data, dict):
+            data = {key: (None if value == '' else value) for key, value in data.items()}
+        return super().to_internal_value(data)
+
+
+class AccountImport_POST_Serializer(BaseSerializer):
+    """
+    다른 비밀번호 관리자에서 내보낸 계정들을 한 번에 가져옴.
+
+    group 은 app_package_name, group_name 순서로 기존 group 에 합치고(SNS 패키지는 SNS group 으로 생성),
+    같은 group 에 같은 user_id 가 이미 있으면 건너뜀. 잘못된 항목도 건너뛰고 skipped 에 사유를 남김.
+    group/detail/account 는 한 트랜잭션 안에서 bulk_create 로 저장함.
+    """
+    accounts = serializers.ListField(
+        child=serializers.DictField(),
+        allow_empty=False,
+        max_length=IMPORT_LIMIT,
+    )
+
+    def __init__(self, user=None, instance=None, data=empty, **kwargs):
+        super().__init__(user, instance, data, **kwargs)
+
+        self.items = []
+        self.skipped = []
+
+    def is_valid(self, raise_exception=False):
+        if not super().is_valid(raise_exception):
+            return False
+
+        for index, account in enumerate(self.validated_data['accounts']):
+            item_serializer = AccountImportItemSerializer(data=account)
+            if item_serializer.is_valid():
+                self.items.append((index, item_serializer.validated_data))
+            else:
+                self.skipped.append({'index': index, 'code': 'field_error', 'detail': item_serializer.errors})
+
+        return True
+
+    def save(self, **kwargs):
+        user_id = self.user.id
+
+        groups = list(queries.get_groups(user_id))
+        groups_by_package = {group.app_package_name: group for group in groups if group.app_package_name}
+        groups_by_name = {group.group_name: group for group in groups}
+        existing_details = set(queries.get_details(user_id).values_list('group_id', 'user_id'))
+        sns_by_package = {sns.app_package_name: sns for sns in SNS.objects.all()}
+
+        new_groups = []
+        new_group_ids = set()
+        merged_group_ids = set()
+        new_details = []
+        new_accounts = []
+
+        for index, item in self.items:
+            package = item['app_package_name']
+            sns = sns_by_package.get(package)
+            group_name = item['group_name'] if sns is None else sns.name
+
+            group = groups_by_package.get(package) if package else None
+            if group is None:
+                group = groups_by_name.get(group_name)
+
+            if group is None:
+                group = self._new_group(user_id, item, sns)
+                new_groups.append(group)
+                new_group_ids.add(group.id)
+                groups_by_name[group.group_name] = group
+                if group.app_package_name:
+                    groups_by_package[group.app_package_name] = group
+            elif group.id not in new_group_ids:
+                merged_group_ids.add(group.id)
+
+            if (group.id, item['user_id']) in existing_details:
+                self.skipped.append({'index': index, 'code': 'duplicated', 'detail': {'user_id': item['user_id']}})
+                continue
+            existing_details.add((group.id, item['user_id']))
+
+            detail = AccountDetail(
+                group=group,
+                user_id=item['user_id'],
+                user_password=item['user_password'],
+                memo=item['memo'],
+            )
+            new_details.append(detail)
+            new_accounts.append(Account(own_group=group, detail=detail))
+
+        # 비밀번호는 한 번의 encrypt_many() 로 암호화
+        encrypted_passwords = AESCipher().encrypt_many([detail.user_password for detail in new_details])
+        for detail, encrypted_password in zip(new_details, encrypted_passwords):
+            detail.user_password = encrypted_password
+
+        try:
+            with transaction.atomic():
+                AccountGroup.objects.bulk_create(new_groups)
+                AccountDetail.objects.bulk_create(new_details)
+                Account.objects.bulk_create(new_accounts)
+                search.index_groups(new_groups, replace=False)
+                search.index_details(user_id, new_details, replace=False)
+        except IntegrityError as e:
+            raise exceptions.DuplicatedException(accounts=str(e))
+
+        autofill_cache.invalidate(user_id)
+
+        self.results = {
+            'groups_created': len(new_groups),
+            'groups_merged': len(merged_group_ids),
+            'details_created': len(new_details),
+            'skipped': self.skipped,
+        }
+        return self.results
+
+    @classmethod
+    def _new_group(cls, user_id, item, sns) -> AccountGroup:
+        if sns is not None:
+            return AccountGroup(
+                mwodeola_user_id=user_id,
+                sns=sns,
+                group_name=sns.name,
+                app_package_name=sns.app_package_name,
+                web_url=item['web_url'] or sns.web_url,
+                icon_type=3,
+            )
+        return AccountGroup(
+            mwodeola_user_id=user_id,
+            group_name=item['group_name'],
+            app_package_name=item['app_package_name'],
+            web_url=item['web_url'],
+            icon_type=0 if item['app_package_name'] is None else 2,
+        )
+
+
+class AccountExportSerializer(BaseSerializer):
+    """
+    전체 보관함(group, detail, account)을 한 줄에 하나씩 내보냄(NDJSON).
+    첫 줄은 header, 이후 {"type": "group"|"detail"|"account", "data": {...}}.
+    각 테이블은 .iterator() 로 chunk 단위로 읽고 chunk 마다 한 번에 복호화하므로 보관함 크기와 관계없이 메모리 사용량이 일정함.
+    """
+    EXPORT_VERSION = 1
+
+    compression = serializers.ChoiceField(choices=['none', 'gzip'], required=False, default='none')
+
+    @property
+    def compress(self):
+        return self.validated_data['compression'] == 'gzip'
+
+    @property
+    def filename(self):
+        exported_at = timezone.now().strftime('%Y%m%d%H%M%S')
+        return f'mwodeola-{exported_at}.ndjson' + ('.gz' if self.compress else '')
+
+    def iter_results(self):
+        user_id = self.user.id
+
+        yield {
+            'type': 'header',
+            'version': self.EXPORT_VERSION,
+            'exported_at': timezone.now(),
+        }
+
+        groups, details, accounts = queries.get_export_querysets(user_id)
+
+        for record_type, serializer in [
+            ('group', AccountGroupSerializerForRead(groups, many=True)),
+            ('detail', AccountDetailSerializer(details, many=True)),
+            ('account', AccountSerializerForSync(accounts, many=True)),
+        ]:
+            for data in serializer.iter_representation():
+                yield {'type': record_type, 'data': data}
+
+
 class GET_AccountForAutofillServiceSerializer(BaseSerializer):
     app_package_name = serializers.CharField(max_length=100)
 
@@ -613,22 +845,30 @@ class GET_AccountForAutofillServiceSerializer(BaseSerializer):
 
         app_package_name = self.validated_data['app_package_name']
 
-        q1 = Q(mwodeola_user=self.user)
-        q1.add(Q(app_package_name=app_package_name), q1.AND)
+        cache_key, results = autofill_cache.get(self.user.id, app_package_name)
+
+        # 캐시된 응답도 조회수는 그대로 올림 (view_counter 에만 쌓이므로 DB 쓰기 없음)
+        # 캐시 이후 바뀐 조회수는 views 만 한 번의 쿼리로 다시 읽어 채움
+        if results is not None:
+            detail_ids = [uuid.UUID(account['detail']['id']) for account in results]
+            views = dict(queries.get_detail_views(detail_ids))
+            for account, detail_id in zip(results, detail_ids):
+                account['detail']['views'] = views.get(detail_id, 0) + view_counter.pending(detail_id)
+            view_counter.add_many(detail_ids)
+            self.results = results
+            return True
 
-        groups = AccountGroup.objects.filter(q1)
+        groups = queries.get_autofill_groups(self.user.id, app_package_name)
         group_ids = []
         for group in groups:
             group_ids.append(group.id)
 
-        q2 = Q(own_group__in=group_ids)
-        q2.add(Q(sns_group=None), q2.AND)
-
-        accounts = Account.objects.filter(q2)
+        accounts = queries.get_autofill_accounts(group_ids)
 
         serializer = AccountSerializerForRead(accounts, many=True)
 
-        self.results = serializer.data
+        self.results = list(serializer.data)
+        autofill_cache.set(cache_key, self.results)
         return True
 
 
@@ -647,11 +887,8 @@ class POST_AccountForAutofillServiceSerializer(BaseSerializer):
         user_id = self.validated_data['user_id']
         user_password = self.validated_data['user_password']
 
-        q1 = Q(mwodeola_user=self.user)
-        q1.add(Q(app_package_name=app_package_name), q1.AND)
-
         try:
-            group = AccountGroup.objects.get(q1)
+            group = queries.get_autofill_groups(self.user.id, app_package_name).get()
         except ObjectDoesNotExist:
             group = None
 
@@ -678,6 +915,7 @@ class POST_AccountForAutofillServiceSerializer(BaseSerializer):
             else:
                 self.results['code'] = 'detail_updated'
 
+        autofill_cache.invalidate(self.user.id)
         return True
 
     def save(self, **kwargs):
@@ -693,6 +931,7 @@ class POST_AccountForAutofillServiceSerializer(BaseSerializer):
                 app_package_name=app_package_name,
                 icon_type=2,
             )
+            search.index_groups([new_group], replace=False)
 
             return new_group
         except IntegrityError as e:
@@ -709,6 +948,7 @@ class POST_AccountForAutofillServiceSerializer(BaseSerializer):
                 web_url=sns.web_url,
                 icon_type=3,
             )
+            search.index_groups([new_group], replace=False)
 
             return new_group
         except IntegrityError as e:
@@ -721,7 +961,7 @@ class POST_AccountForAutofillServiceSerializer(BaseSerializer):
         now_date_time = cls._get_datetime_now()
 
         try:
-            detail = AccountDetail.objects.get(group=group, user_id=user_id)
+            detail = queries.get_autofill_detail(group, user_id).get()
         except ObjectDoesNotExist:
             detail = None
 
@@ -737,6 +977,7 @@ class POST_AccountForAutofillServiceSerializer(BaseSerializer):
                 own_group=group,
                 detail=new_detail
             )
+            search.index_details(group.mwodeola_user_id, [new_detail], replace=False)
             return True
         else:
             detail.user_password = encrypted_password
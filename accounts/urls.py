@@ -47,5 +47,17 @@ urlpatterns = [
     #       but, already exists based on app_package_name, it updates the existing data.
     path('account/for_autofill_service', views.AccountForAutofillServiceView.as_view()),
 
+    # POST: import accounts from other password managers.
+    #       json {"accounts": [...]} or multipart csv file(field name 'file').
+    path('account/import', views.AccountImportView.as_view()),
+
+    # GET: account/export?compression=none|gzip
+    #      all groups, details, accounts as newline-delimited json (backup).
+    path('account/export', views.AccountExportView.as_view()),
+
+    # GET: account/sync?cursor=
+    #      changes(groups, details, accounts, deleted ids) since cursor. without cursor, all data.
+    path('account/sync', views.AccountSyncView.as_view()),
+
 
 ]
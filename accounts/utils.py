@@ -1,5 +1,30 @@
-from .models import AccountGroup
+import csv
+import io
+
+from .models import AccountGroup, AccountTombstone
 from django.core.exceptions import ObjectDoesNotExist
+from _mwodeola import exceptions
+
+# 다른 비밀번호 관리자(Chrome, Bitwarden, LastPass 등)의 CSV 컬럼명 -> 가져오기 필드명
+IMPORT_CSV_COLUMNS = {
+    'group_name': 'group_name',
+    'name': 'group_name',
+    'title': 'group_name',
+    'app_package_name': 'app_package_name',
+    'web_url': 'web_url',
+    'url': 'web_url',
+    'login_uri': 'web_url',
+    'user_id': 'user_id',
+    'username': 'user_id',
+    'login_username': 'user_id',
+    'user_password': 'user_password',
+    'password': 'user_password',
+    'login_password': 'user_password',
+    'memo': 'memo',
+    'note': 'memo',
+    'notes': 'memo',
+    'extra': 'memo',
+}
 
 
 def is_sns_group(group_id: int) -> bool:
@@ -9,3 +34,28 @@ def is_sns_group(group_id: int) -> bool:
         return False
 
     return group.sns is not None
+
+
+def add_tombstones(user_id, object_type: int, object_ids):
+    AccountTombstone.objects.bulk_create([
+        AccountTombstone(mwodeola_user_id=user_id, object_type=object_type, object_id=object_id)
+        for object_id in object_ids
+    ])
+
+
+def read_import_csv(file) -> list:
+    text = io.TextIOWrapper(file, encoding='utf-8-sig')
+    rows = []
+    try:
+        for row in csv.DictReader(text):
+            account = {}
+            for column, value in row.items():
+                field = IMPORT_CSV_COLUMNS.get((column or '').strip().lower())
+                if field is not None and field not in account:
+                    account[field] = value
+            rows.append(account)
+    except UnicodeDecodeError:
+        raise exceptions.FieldException(file='CSV file must be UTF-8 encoded')
+    except csv.Error as e:
+        raise exceptions.FieldException(file=f'Invalid CSV file: {e}')
+    return rows
@@ -1,24 +1,48 @@
 from django.http import HttpResponse, JsonResponse
 from django.core.exceptions import ValidationError, ObjectDoesNotExist
 from rest_framework import generics, status, exceptions
+from rest_framework.permissions import SAFE_METHODS
 from rest_framework.views import APIView
 from mwodeola_users.auth import get_raw_token, get_user_from_request_token
+from mwodeola_users.auth.authentications import JWTTokenUserAuthentication
+from _mwodeola.responses import StreamingJsonResponse, StreamingNdjsonResponse
 
 from .models import AccountGroup, AccountDetail
 from . import serializers
 from .mixins import AccountMixin
+from .pagination import KeysetPaginator, NEXT_CURSOR_HEADER
+from .utils import read_import_csv
 
 
 class BaseAPIView(APIView, AccountMixin):
+    # True 이면 목록 결과를 serializer 가 만드는 대로 한 행씩 내려보냄
+    streaming = False
+    # GET 요청에만 적용할 authentication_classes.
+    # request.user.id 만 쓰는 조회 view 는 JWTTokenUserAuthentication 으로 user 조회 없이 인증함
+    read_only_authentication_classes = None
+    # True 이면 GET 요청의 cursor/page_size 파라미터로 keyset 페이지네이션을 적용함 (accounts.pagination)
+    # 페이지 단위 응답은 스트리밍하지 않음
+    paginated = False
+    pagination_ordering = None
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.serializer = None
+        self.paginator = None
         # self.request_user = None
 
+    def initialize_request(self, request, *args, **kwargs):
+        request = super().initialize_request(request, *args, **kwargs)
+        if self.read_only_authentication_classes is not None and request.method in SAFE_METHODS:
+            request.authenticators = [auth() for auth in self.read_only_authentication_classes]
+        return request
+
     def initial(self, request, *args, **kwargs):
         super().initial(request, *args, **kwargs)
         self.serializer = None
+        self.paginator = None
+        if self.paginated and request.method in SAFE_METHODS:
+            self.paginator = KeysetPaginator.from_request(request, ordering=self.pagination_ordering)
         # self.request_user = get_user_from_request_token(request)
 
     def get(self, request):
@@ -44,17 +68,36 @@ class BaseAPIView(APIView, AccountMixin):
                 serializer.save()
             if request.method == 'DELETE':
                 serializer.delete()
-            return JsonResponse(serializer.results, safe=False, status=status.HTTP_200_OK)
+            if self.streaming and self.paginator is None \
+                    and getattr(serializer, 'results_serializer', None) is not None:
+                return StreamingJsonResponse(serializer.iter_results(), status=status.HTTP_200_OK)
+            return self.paginated_response(JsonResponse(serializer.results, safe=False, status=status.HTTP_200_OK))
         else:
             return JsonResponse(serializer.err_messages, status=serializer.err_status)
 
+    def list_response(self, serializer):
+        if self.streaming and self.paginator is None:
+            return StreamingJsonResponse(serializer.iter_representation(), status=status.HTTP_200_OK)
+        return self.paginated_response(JsonResponse(serializer.data, safe=False, status=status.HTTP_200_OK))
+
+    def paginated_response(self, response):
+        if self.paginator is not None and self.paginator.next_cursor is not None:
+            response[NEXT_CURSOR_HEADER] = self.paginator.next_cursor
+        return response
+
+    def get_serializer_context(self):
+        return {'paginator': self.paginator}
+
 
 class AccountGroupView(BaseAPIView):
+    streaming = True
+    paginated = True
+    read_only_authentication_classes = [JWTTokenUserAuthentication]
 
     def get(self, request):
         groups = self.get_all_account_group_by(request)
-        serializer = serializers.AccountGroup_GET_Serializer(groups, many=True)
-        return JsonResponse(serializer.data, safe=False, status=status.HTTP_200_OK)
+        serializer = serializers.AccountGroup_GET_Serializer(groups, many=True, context=self.get_serializer_context())
+        return self.list_response(serializer)
 
     def put(self, request):
         request.data['mwodeola_user'] = request.user.id
@@ -115,18 +158,25 @@ class AccountGroupSnsDetailView(BaseAPIView):
 
 
 class AccountGroupDetailAllView(BaseAPIView):
+    streaming = True
+    paginated = True
+    read_only_authentication_classes = [JWTTokenUserAuthentication]
 
     def get(self, request):
         data = {'account_group_id': request.GET.get('group_id', None)}
-        self.serializer = serializers.AccountGroupDetailAllSerializer(user=request.user, data=data)
+        self.serializer = serializers.AccountGroupDetailAllSerializer(
+            user=request.user, data=data, context=self.get_serializer_context())
         return super().get(request)
 
 
 class AccountGroupDetailAllSimpleView(BaseAPIView):
+    paginated = True
+    read_only_authentication_classes = [JWTTokenUserAuthentication]
 
     def get(self, request):
         data = {'account_group_id': request.GET.get('group_id', None)}
-        self.serializer = serializers.AccountGroupDetailAllSimpleSerializer(user=request.user, data=data)
+        self.serializer = serializers.AccountGroupDetailAllSimpleSerializer(
+            user=request.user, data=data, context=self.get_serializer_context())
         return super().get(request)
 
 
@@ -142,31 +192,78 @@ class AccountDetailView(BaseAPIView):
 
 
 class AccountSearchGroupView(BaseAPIView):
+    # 페이지 단위로 조회하면 검색 순위 대신 (created_at, id) 순으로 정렬됨
+    paginated = True
+    read_only_authentication_classes = [JWTTokenUserAuthentication]
 
     def get(self, request):
         group_name = request.GET.get('group_name', None)
         data = {'group_name': group_name}
-        self.serializer = serializers.AccountSearchGroupSerializer(user=request.user, data=data)
+        self.serializer = serializers.AccountSearchGroupSerializer(
+            user=request.user, data=data, context=self.get_serializer_context())
         return super().get(request)
 
 
 class AccountSearchDetailView(BaseAPIView):
+    # 페이지 단위로 조회하면 검색 순위 대신 (created_at, id) 순으로 정렬됨
+    paginated = True
+    read_only_authentication_classes = [JWTTokenUserAuthentication]
 
     def get(self, request):
         user_id = request.GET.get('user_id', None)
         data = {'user_id': user_id}
-        self.serializer = serializers.AccountSearchDetailSerializer(user=request.user, data=data)
+        self.serializer = serializers.AccountSearchDetailSerializer(
+            user=request.user, data=data, context=self.get_serializer_context())
         return super().get(request)
 
 
 class AccountUserIdsView(BaseAPIView):
+    paginated = True
+    # 중복을 제거한 값 목록이라 (created_at, id) 대신 user_id 자체를 keyset 으로 사용
+    pagination_ordering = ('user_id',)
+    read_only_authentication_classes = [JWTTokenUserAuthentication]
+
+    def get(self, request):
+        self.serializer = serializers.AccountUserIdsSerializer(user=request.user, context=self.get_serializer_context())
+        return super().get(request)
+
+
+class AccountImportView(BaseAPIView):
+
+    def post(self, request):
+        csv_file = request.FILES.get('file', None)
+        if csv_file is None:
+            data = request.data
+        else:
+            data = {'accounts': read_import_csv(csv_file)}
+        self.serializer = serializers.AccountImport_POST_Serializer(user=request.user, data=data)
+        return super().post(request)
+
+
+class AccountExportView(BaseAPIView):
+
+    def get(self, request):
+        # 'format' 은 DRF 의 URL format override 로 쓰이므로 사용하지 않음
+        data = {'compression': request.GET.get('compression', 'none')}
+        serializer = serializers.AccountExportSerializer(user=request.user, data=data)
+        if not serializer.is_valid():
+            return JsonResponse(serializer.err_messages, status=serializer.err_status)
+        return StreamingNdjsonResponse(serializer.iter_results(),
+                                       filename=serializer.filename,
+                                       compress=serializer.compress,
+                                       status=status.HTTP_200_OK)
+
+
+class AccountSyncView(BaseAPIView):
 
     def get(self, request):
-        self.serializer = serializers.AccountUserIdsSerializer(user=request.user)
+        data = {'cursor': request.GET.get('cursor', None)}
+        self.serializer = serializers.AccountSyncSerializer(user=request.user, data=data)
         return super().get(request)
 
 
 class AccountForAutofillServiceView(BaseAPIView):
+    read_only_authentication_classes = [JWTTokenUserAuthentication]
 
     def get(self, request):
         app_package_name = request.GET.get('app_package_name', None)
@@ -47,6 +47,18 @@ def get_raw_token(request):
 
 
 def get_user_from_request_token(request):
+    """
+    DRF 인증에서 이미 찾은 user(request.user)가 있으면 그대로 사용하고,
+    없으면 토큰을 검증해서 찾은 user 를 request 에 기억해 둠 (요청마다 JWT 검증은 한 번만).
+    """
+    user = getattr(request, 'user', None)
+    if isinstance(user, get_user_model()):
+        return user
+
+    user = getattr(request, '_token_user', None)
+    if user is not None:
+        return user
+
     raw_token = get_raw_token(request)
     validated_token = UntypedToken(raw_token)
 
@@ -69,4 +81,5 @@ def get_user_from_request_token(request):
     if user.is_locked:
         raise AuthenticationFailed(_('User is locked'), code='user_locked')
 
+    request._token_user = user
     return user
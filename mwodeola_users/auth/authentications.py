@@ -1,11 +1,17 @@
+import uuid
+
 from django.contrib.auth import get_user_model
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 from rest_framework import HTTP_HEADER_ENCODING, authentication, exceptions
 
+from rest_framework_simplejwt.models import TokenUser as BaseTokenUser
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken, TokenError
 from rest_framework_simplejwt.settings import api_settings
 
+from .caches import auth_user_cache
+
 AUTH_HEADER_TYPES = api_settings.AUTH_HEADER_TYPES
 
 if not isinstance(api_settings.AUTH_HEADER_TYPES, (list, tuple)):
@@ -24,6 +30,8 @@ class JWTAuthentication(authentication.BaseAuthentication):
     """
     www_authenticate_realm = 'api'
     media_type = 'application/json'
+    # True 이면 user 를 auth_user_cache 에서 먼저 찾음 (request.user 를 수정/저장하는 view 는 False)
+    use_user_cache = True
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -113,10 +121,18 @@ class JWTAuthentication(authentication.BaseAuthentication):
         except KeyError:
             raise InvalidToken(_('Token contained no recognizable user identification'))
 
-        try:
-            user = self.user_model.objects.get(**{api_settings.USER_ID_FIELD: user_id})
-        except self.user_model.DoesNotExist:
-            raise AuthenticationFailed(_('User not found'), code='user_not_found')
+        self.check_token_revoked(validated_token, user_id)
+
+        user = auth_user_cache.get(user_id) if self.use_user_cache else None
+
+        if user is None:
+            try:
+                user = self.user_model.objects.get(**{api_settings.USER_ID_FIELD: user_id})
+            except self.user_model.DoesNotExist:
+                raise AuthenticationFailed(_('User not found'), code='user_not_found')
+
+            if self.use_user_cache:
+                auth_user_cache.set(user)
 
         if user.is_locked:
             raise AuthenticationFailed(_('User is locked'), code='user_locked')
@@ -126,8 +142,17 @@ class JWTAuthentication(authentication.BaseAuthentication):
 
         return user
 
+    @classmethod
+    def check_token_revoked(cls, validated_token, user_id):
+        # 비밀번호 변경 등으로 revoke_all_tokens() 한 시각 이전에 발급된 토큰은 거부함
+        valid_after = auth_user_cache.get_tokens_valid_after(user_id)
+        if valid_after is not None and validated_token.get('iat', 0) < valid_after:
+            raise AuthenticationFailed(_('Token has been revoked'), code='token_revoked')
+
 
 class JWTAuthenticationForRefresh(JWTAuthentication):
+    use_user_cache = False
+
     def get_validated_token(self, raw_token):
         """
         Validates an encoded JSON web token and returns a validated token
@@ -148,7 +173,31 @@ class JWTAuthenticationForRefresh(JWTAuthentication):
         })
 
 
+class TokenUser(BaseTokenUser):
+    """
+    토큰의 claim 만으로 만든 user. id 는 MwodeolaUser.id 와 비교할 수 있도록 UUID 로 변환함.
+    """
+
+    @cached_property
+    def id(self):
+        return uuid.UUID(str(self.token[api_settings.USER_ID_CLAIM]))
+
+    @cached_property
+    def is_active(self):
+        return self.token.get('is_active', True)
+
+    @cached_property
+    def is_locked(self):
+        return self.token.get('is_locked', False)
+
+
 class JWTTokenUserAuthentication(JWTAuthentication):
+    """
+    DB 조회 없이 토큰 claim 으로 만든 TokenUser 를 반환함. request.user.id 만 쓰는 조회용 view 에서 사용.
+
+    잠금/탈퇴 상태는 이 프로세스에서 user 를 저장할 때 남긴 auth_user_cache 의 state 가 있으면 그 값을,
+    없으면 토큰 발급 시점의 claim 을 따름.
+    """
     def get_user(self, validated_token):
         """
         Returns a stateless user object which is backed by the given validated
@@ -159,7 +208,25 @@ class JWTTokenUserAuthentication(JWTAuthentication):
             # identifier claim.
             raise InvalidToken(_('Token contained no recognizable user identification'))
 
-        return api_settings.TOKEN_USER_CLASS(validated_token)
+        user = TokenUser(validated_token)
+
+        try:
+            user_id = user.id
+        except ValueError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+
+        self.check_token_revoked(validated_token, user_id)
+
+        state = auth_user_cache.get_state(user_id)
+        is_active, is_locked = state if state is not None else (user.is_active, user.is_locked)
+
+        if is_locked:
+            raise AuthenticationFailed(_('User is locked'), code='user_locked')
+
+        if not is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+
+        return user
 
 
 def default_user_authentication_rule(user):
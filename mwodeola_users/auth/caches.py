@@ -0,0 +1,69 @@
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework_simplejwt.settings import api_settings
+
+
+AUTH_USER_CACHE_ALIAS = 'auth'
+
+AUTH_USER_CACHE_TIMEOUT_DEFAULT = 30  # seconds
+AUTH_USER_CACHE_TIMEOUT = getattr(settings, "AUTH_USER_CACHE_TIMEOUT", AUTH_USER_CACHE_TIMEOUT_DEFAULT)
+
+
+class AuthUserCache:
+    """
+    access 토큰 인증(JWTAuthentication.get_user)에서 조회한 user 를 user_id 단위로 캐시함.
+
+    MwodeolaUser.save()/delete() 에서 invalidate() 하므로 잠금/탈퇴/비밀번호 변경은 다음 요청부터 바로 반영되고,
+    이 프로세스 밖에서 바뀐 값(다른 프로세스, queryset.update() 등)도 timeout 이내에는 반영됨.
+    user row(비밀번호 해시 포함)가 들어가므로 'auth' 캐시는 프로세스 로컬(LocMemCache)로만 설정해야 함.
+    """
+
+    def __init__(self, alias=AUTH_USER_CACHE_ALIAS, timeout=AUTH_USER_CACHE_TIMEOUT):
+        self.alias = alias
+        self.timeout = timeout
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def get(self, user_id):
+        return self.cache.get(self._key(user_id))
+
+    def set(self, user):
+        self.cache.set(self._key(user.id), user, self.timeout)
+
+    def invalidate(self, user_id):
+        self.cache.delete(self._key(user_id))
+
+    def get_state(self, user_id):
+        return self.cache.get(self._state_key(user_id))
+
+    def set_state(self, user_id, is_active, is_locked):
+        # 토큰 claim 의 (is_active, is_locked) 보다 우선함.
+        # 그 claim 을 가진 access 토큰이 만료될 때까지 유지되어야 하므로 timeout 은 access 토큰 유효기간.
+        timeout = api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()
+        self.cache.set(self._state_key(user_id), (is_active, is_locked), timeout)
+
+    def get_tokens_valid_after(self, user_id):
+        return self.cache.get(self._valid_after_key(user_id))
+
+    def set_tokens_valid_after(self, user_id, timestamp):
+        # iat 가 timestamp 보다 이전인 토큰은 거부함 (비밀번호 변경 등).
+        # refresh 토큰은 DB 블랙리스트로 막으므로 access 토큰이 만료될 때까지만 유지하면 됨.
+        timeout = api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()
+        self.cache.set(self._valid_after_key(user_id), timestamp, timeout)
+
+    @classmethod
+    def _key(cls, user_id):
+        return f'auth:user:{user_id}'
+
+    @classmethod
+    def _state_key(cls, user_id):
+        return f'auth:state:{user_id}'
+
+    @classmethod
+    def _valid_after_key(cls, user_id):
+        return f'auth:valid_after:{user_id}'
+
+
+auth_user_cache = AuthUserCache()
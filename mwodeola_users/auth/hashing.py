@@ -0,0 +1,132 @@
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+from _mwodeola import exceptions
+# worker 프로세스에서 import 되는 함수는 앱 로딩 전에 import 할 수 있는 모듈에 있어야 함
+from ..hashers import init_hashing_worker, hashing_check_password, hashing_make_password
+
+
+# WORKERS: 해시 계산용 프로세스 수 (기본값 0: 요청 스레드에서 바로 계산, 풀은 켜야 사용함)
+# MAX_PENDING: 계산 중이거나 대기 중인 해시 수의 상한. 넘으면 바로 503
+# TIMEOUT: 해시 하나를 기다리는 최대 시간(초). 넘으면 503
+# PYTHON: worker 를 실행할 python 인터프리터. uwsgi 에서는 sys.executable 이 uwsgi 바이너리이므로
+#         None 이면 sys.prefix(virtualenv) 의 bin/python 을 사용함
+AUTH_HASHING_DEFAULT = {
+    'WORKERS': 0,
+    'MAX_PENDING': 32,
+    'TIMEOUT': 10,
+    'PYTHON': None,
+}
+AUTH_HASHING = {**AUTH_HASHING_DEFAULT, **getattr(settings, "AUTH_HASHING", {})}
+
+
+class PasswordHashingPool:
+    """
+    비밀번호 해시(PBKDF2/scrypt)를 요청 스레드 대신 별도 프로세스 풀에서 계산함.
+    로그인이 몰려도 해시 계산은 WORKERS 개의 프로세스만 쓰므로 다른 요청(보관함 조회 등)의 스레드와 GIL 을 잡지 않고,
+    대기 중인 해시가 MAX_PENDING 을 넘으면 기다리지 않고 ServiceUnavailableException(503)으로 거절함.
+    WSGI/ASGI 어느 쪽에서 호출해도 동작함 (ASGI 에서도 DRF view 는 스레드에서 실행됨).
+
+    worker 는 spawn 으로 python 인터프리터를 새로 띄우므로 PYTHON 이 실제 인터프리터를 가리켜야 하고,
+    풀을 켠 뒤에는 배포 환경(uwsgi)에서 로그인이 503(password_hashing_unavailable) 없이 동작하는지 확인해야 함.
+    """
+
+    def __init__(self, workers=None, max_pending=None, timeout=None, python=None):
+        self.workers = AUTH_HASHING['WORKERS'] if workers is None else workers
+        self.max_pending = AUTH_HASHING['MAX_PENDING'] if max_pending is None else max_pending
+        self.timeout = AUTH_HASHING['TIMEOUT'] if timeout is None else timeout
+        self.python = AUTH_HASHING['PYTHON'] if python is None else python
+
+        self._pending = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self._executor = None
+
+    @property
+    def executor(self):
+        # 처음 사용할 때 만듦 (uwsgi 가 worker 를 fork 한 뒤에 프로세스가 생기도록)
+        with self._lock:
+            if self._executor is None:
+                mp_context = multiprocessing.get_context('spawn')
+                mp_context.set_executable(self.get_python())
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=mp_context,
+                    initializer=init_hashing_worker,
+                    initargs=(os.environ.get('DJANGO_SETTINGS_MODULE', '_mwodeola.settings'),),
+                )
+            return self._executor
+
+    def get_python(self):
+        if self.python:
+            return self.python
+        python = os.path.join(sys.prefix, 'bin', 'python')
+        return python if os.path.exists(python) else sys.executable
+
+    def run(self, fn, *args):
+        if self.workers == 0:
+            return fn(*args)
+
+        if not self._pending.acquire(blocking=False):
+            raise exceptions.ServiceUnavailableException(reason='password_hashing_overloaded')
+
+        try:
+            future = self.executor.submit(fn, *args)
+        except BrokenProcessPool:
+            self._pending.release()
+            self._reset_executor()
+            raise exceptions.ServiceUnavailableException(reason='password_hashing_unavailable')
+        except BaseException:
+            self._pending.release()
+            raise
+
+        # 시간 초과로 먼저 응답해도 worker 에서는 계속 계산하므로, 계산이 끝날 때 자리를 반납함
+        future.add_done_callback(lambda _: self._pending.release())
+
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            raise exceptions.ServiceUnavailableException(reason='password_hashing_timeout')
+        except BrokenProcessPool:
+            self._reset_executor()
+            raise exceptions.ServiceUnavailableException(reason='password_hashing_unavailable')
+
+    def _reset_executor(self):
+        # worker 가 죽으면 다음 요청에서 풀을 다시 만듦
+        with self._lock:
+            self._executor = None
+
+    def make_password(self, password):
+        if password is None:
+            return hashers.make_password(None)
+        return self.run(hashing_make_password, password)
+
+    def check_password(self, password, encoded, setter=None):
+        """
+        django.contrib.auth.hashers.check_password() 와 같음. 검증만 풀에서 하고,
+        비용/알고리즘이 바뀐 해시는 로그인 성공 시 setter 로 다시 해시함.
+        """
+        if password is None or not hashers.is_password_usable(encoded):
+            return False
+
+        try:
+            hasher = hashers.identify_hasher(encoded)
+        except ValueError:
+            return False
+
+        is_correct = self.run(hashing_check_password, password, encoded)
+
+        preferred = hashers.get_hasher('default')
+        must_update = hasher.algorithm != preferred.algorithm or preferred.must_update(encoded)
+        if setter and is_correct and must_update:
+            setter(password)
+        return is_correct
+
+
+password_hashing = PasswordHashingPool()
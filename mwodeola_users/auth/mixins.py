@@ -1,146 +1,66 @@
 from django.conf import settings
-from django.contrib.auth import authenticate
-from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import Case, F, Q, Value, When
+from django.utils import timezone
 from rest_framework import status
-from rest_framework_simplejwt.tokens import RefreshToken
-from rest_framework_simplejwt.token_blacklist.models import OutstandingToken, BlacklistedToken
 
 from ..models import MwodeolaUser
+from .caches import auth_user_cache
+from .throttles import auth_rate_limiter
+from .tokens import blacklist_all_tokens
 
 
 AUTH_LIMIT_DEFAULT = 5
 AUTH_LIMIT = getattr(settings, "AUTH_LIMIT", AUTH_LIMIT_DEFAULT)
 
+# 인증과 인증 후 처리(토큰 발급, 실패 횟수/잠금 저장, 비밀번호 변경)에 필요한 컬럼
+AUTH_USER_FIELDS = (
+    'id',
+    'phone_number',
+    'password',
+    'is_active',
+    'is_locked',
+    'count_auth_failed',
+    'updated_at',
+)
+
 
 class UserAuthMixin:
 
     def get_user_by_authentication_rule(self, phone_number, password):
-        user = None
+        return self._authenticate(phone_number, password, check_locked=True, check_inactive=True)
 
-        try:
-            user = MwodeolaUser.objects.get(phone_number=phone_number)
-        except ObjectDoesNotExist as e:
-            pass
+    def get_user_for_inactive_user(self, phone_number, password):
+        return self._authenticate(phone_number, password, check_locked=True, check_inactive=False)
 
-        if user is None:
-            self.err_messages['message'] = 'User not found'
-            self.err_messages['code'] = 'user_not_found'
-            self.err_status = status.HTTP_401_UNAUTHORIZED
-            return None
-        if self._is_locked_user(user):
-            return None
-        if self._is_inactive_user(user):
-            return None
+    def get_user_for_locked_user(self, phone_number, password):
+        return self._authenticate(phone_number, password, check_locked=False, check_inactive=False)
 
-        result = authenticate(phone_number=phone_number, password=password)
-
-        if result is None:
-            if user.count_auth_failed < AUTH_LIMIT - 1:
-                user.count_auth_failed += 1
-                user.save()
-                self.err_messages['message'] = 'Authentication failed'
-                self.err_messages['code'] = 'authentication_failed'
-                self.err_messages['count'] = user.count_auth_failed
-                self.err_messages['limit'] = AUTH_LIMIT
-                self.err_status = status.HTTP_401_UNAUTHORIZED
-            else:
-                user.count_auth_failed += 1
-                user.is_locked = True
-                user.save()
-                self._blacklist_all(user)
-                self.err_messages['message'] = 'Exceeded number of authentications'
-                self.err_messages['code'] = 'authentication_exceed'
-                self.err_messages['count'] = user.count_auth_failed
-                self.err_messages['limit'] = AUTH_LIMIT
-                self.err_status = status.HTTP_403_FORBIDDEN
+    def _authenticate(self, phone_number, password, check_locked, check_inactive):
+        # user 는 한 번만 조회하고(필요한 컬럼만), 그 instance 로 비밀번호를 검증함
+        # (authenticate() 는 model backend 에서 같은 user 를 다시 조회함)
+        if self._is_rate_limited(phone_number):
             return None
 
-        user.count_auth_failed = 0
-        user.save()
-        return user
-
-    def get_user_for_inactive_user(self, phone_number, password):
-        user = None
-
-        try:
-            user = MwodeolaUser.objects.get(phone_number=phone_number)
-        except ObjectDoesNotExist as e:
-            pass
+        user = MwodeolaUser.objects \
+            .only(*AUTH_USER_FIELDS) \
+            .filter(phone_number=phone_number) \
+            .first()
 
         if user is None:
             self.err_messages['message'] = 'User not found'
             self.err_messages['code'] = 'user_not_found'
             self.err_status = status.HTTP_401_UNAUTHORIZED
             return None
-        if self._is_locked_user(user):
+        if check_locked and self._is_locked_user(user):
             return None
-
-        authed_user = authenticate(phone_number=phone_number, password=password)
-
-        if authed_user is None:
-            if user.count_auth_failed < AUTH_LIMIT - 1:
-                user.count_auth_failed += 1
-                user.save()
-                self.err_messages['message'] = 'Authentication failed'
-                self.err_messages['code'] = 'authentication_failed'
-                self.err_messages['count'] = user.count_auth_failed
-                self.err_messages['limit'] = AUTH_LIMIT
-                self.err_status = status.HTTP_401_UNAUTHORIZED
-            else:
-                user.count_auth_failed += 1
-                user.is_locked = True
-                user.save()
-                self._blacklist_all(user)
-                self.err_messages['message'] = 'Exceeded number of authentications'
-                self.err_messages['code'] = 'authentication_exceed'
-                self.err_messages['count'] = user.count_auth_failed
-                self.err_messages['limit'] = AUTH_LIMIT
-                self.err_status = status.HTTP_403_FORBIDDEN
+        if check_inactive and self._is_inactive_user(user):
             return None
 
-        user.count_auth_failed = 0
-        user.save()
-        return user
-
-    def get_user_for_locked_user(self, phone_number, password):
-        user = None
-
-        try:
-            user = MwodeolaUser.objects.get(phone_number=phone_number)
-        except ObjectDoesNotExist as e:
-            pass
-
-        if user is None:
-            self.err_messages['message'] = 'User not found'
-            self.err_messages['code'] = 'user_not_found'
-            self.err_status = status.HTTP_401_UNAUTHORIZED
-            return None
-
-        authed_user = authenticate(phone_number=phone_number, password=password)
-
-        if authed_user is None:
-            if user.count_auth_failed < AUTH_LIMIT - 1:
-                user.count_auth_failed += 1
-                user.save()
-                self.err_messages['message'] = 'Authentication failed'
-                self.err_messages['code'] = 'authentication_failed'
-                self.err_messages['count'] = user.count_auth_failed
-                self.err_messages['limit'] = AUTH_LIMIT
-                self.err_status = status.HTTP_401_UNAUTHORIZED
-            else:
-                user.count_auth_failed += 1
-                user.is_locked = True
-                user.save()
-                self._blacklist_all(user)
-                self.err_messages['message'] = 'Exceeded number of authentications'
-                self.err_messages['code'] = 'authentication_exceed'
-                self.err_messages['count'] = user.count_auth_failed
-                self.err_messages['limit'] = AUTH_LIMIT
-                self.err_status = status.HTTP_403_FORBIDDEN
+        if not user.check_password(password):
+            self._auth_failed(user)
             return None
 
-        user.count_auth_failed = 0
-        user.save()
+        self._auth_succeeded(user)
         return user
 
     def _is_locked_user(self, user) -> bool:
@@ -161,15 +81,58 @@ class UserAuthMixin:
         else:
             return False
 
-    # 성능 이슈
+    def _is_rate_limited(self, phone_number) -> bool:
+        # 비밀번호 해시 계산 전에 IP, phone_number 단위 시도 횟수를 확인함
+        request = getattr(self, 'context', {}).get('request', None)
+        retry_after = auth_rate_limiter.check(request, phone_number)
+        if retry_after is not None:
+            self.err_messages['message'] = 'Too many authentication attempts'
+            self.err_messages['code'] = 'too_many_attempts'
+            self.err_messages['retry_after'] = retry_after
+            self.err_status = status.HTTP_429_TOO_MANY_REQUESTS
+            return True
+        else:
+            return False
+
+    def _auth_failed(self, user):
+        # 실패 횟수 증가와 잠금을 한 번의 조건부 UPDATE 로 처리하고 결과는 DB 에서 다시 읽음
+        # (동시에 실패한 요청들이 각자 옛 값으로 판단하거나 다른 요청의 증가분을 덮어쓰지 않도록)
+        reaches_limit = Q(count_auth_failed__gte=AUTH_LIMIT - 1)
+        MwodeolaUser.objects \
+            .filter(id=user.id) \
+            .update(
+                count_auth_failed=F('count_auth_failed') + 1,
+                is_locked=Case(When(reaches_limit, then=Value(True)), default=F('is_locked')),
+                updated_at=Case(When(reaches_limit, then=Value(timezone.now())), default=F('updated_at')),
+            )
+        user.count_auth_failed, user.is_locked = MwodeolaUser.objects \
+            .filter(id=user.id) \
+            .values_list('count_auth_failed', 'is_locked') \
+            .get()
+        auth_user_cache.invalidate(user.id)
+
+        if user.count_auth_failed < AUTH_LIMIT:
+            self.err_messages['message'] = 'Authentication failed'
+            self.err_messages['code'] = 'authentication_failed'
+            self.err_messages['count'] = user.count_auth_failed
+            self.err_messages['limit'] = AUTH_LIMIT
+            self.err_status = status.HTTP_401_UNAUTHORIZED
+        else:
+            auth_user_cache.set_state(user.id, user.is_active, user.is_locked)
+            self._blacklist_all(user)
+            self.err_messages['message'] = 'Exceeded number of authentications'
+            self.err_messages['code'] = 'authentication_exceed'
+            self.err_messages['count'] = user.count_auth_failed
+            self.err_messages['limit'] = AUTH_LIMIT
+            self.err_status = status.HTTP_403_FORBIDDEN
+
+    @classmethod
+    def _auth_succeeded(cls, user):
+        # 실패 횟수가 남아있을 때만 초기화
+        if user.count_auth_failed != 0:
+            MwodeolaUser.objects.filter(id=user.id).update(count_auth_failed=0)
+            auth_user_cache.invalidate(user.id)
+            user.count_auth_failed = 0
+
     def _blacklist_all(self, user):
-        tokens = OutstandingToken.objects.filter(user_id=user.id)
-        # print(f'tokens.len={len(tokens)}')
-        for token in tokens:
-            try:
-                # print(f'tokens={token.id}')
-                BlacklistedToken.objects.get(token_id=token.id)
-            except ObjectDoesNotExist:
-                # print(f'tokens={token.id} 블랙리스트!!')
-                RefreshToken(token.token).blacklist()
-                continue
+        blacklist_all_tokens(user.id)
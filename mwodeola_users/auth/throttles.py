@@ -0,0 +1,66 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import BaseThrottle
+
+
+AUTH_RATE_LIMIT_CACHE_ALIAS = 'default'
+
+# scope -> (최대 시도 횟수, 기간(초))
+AUTH_RATE_LIMITS_DEFAULT = {
+    'ip': (60, 60),
+    'phone_number': (20, 60),
+}
+AUTH_RATE_LIMITS = getattr(settings, "AUTH_RATE_LIMITS", AUTH_RATE_LIMITS_DEFAULT)
+
+
+class AuthRateLimiter:
+    """
+    비밀번호 인증 시도를 IP, phone_number 단위로 고정 윈도우(period 초)마다 세고,
+    한도를 넘으면 비밀번호 해시를 계산하기 전에 거절할 수 있도록 남은 시간(초)을 반환함.
+    """
+
+    def __init__(self, alias=AUTH_RATE_LIMIT_CACHE_ALIAS, rates=None):
+        self.alias = alias
+        self.rates = AUTH_RATE_LIMITS if rates is None else rates
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def check(self, request, phone_number):
+        # 한도를 넘은 scope 가 있으면 retry_after(초), 없으면 None
+        idents = {'phone_number': phone_number}
+        if request is not None:
+            idents['ip'] = BaseThrottle().get_ident(request)
+
+        retry_after = None
+        for scope, ident in idents.items():
+            if scope not in self.rates or ident is None:
+                continue
+            wait = self.hit(scope, ident)
+            if wait is not None:
+                retry_after = max(wait, retry_after or 0)
+        return retry_after
+
+    def hit(self, scope, ident):
+        limit, period = self.rates[scope]
+        now = int(time.time())
+        key = f'auth:rate:{scope}:{ident}:{now // period}'
+
+        if self.cache.add(key, 1, period):
+            count = 1
+        else:
+            try:
+                count = self.cache.incr(key)
+            except ValueError:
+                self.cache.set(key, 1, period)
+                count = 1
+
+        if count > limit:
+            return period - now % period
+        return None
+
+
+auth_rate_limiter = AuthRateLimiter()
@@ -0,0 +1,72 @@
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken, BlacklistedToken
+from rest_framework_simplejwt.utils import aware_utcnow, datetime_to_epoch
+
+from .caches import auth_user_cache
+
+
+BLACKLIST_BATCH_SIZE = 500
+
+
+class MwodeolaRefreshToken(RefreshToken):
+    """
+    user 의 is_active, is_locked 를 claim 으로 담는 refresh 토큰 (access 토큰에도 그대로 복사됨).
+    JWTTokenUserAuthentication 은 DB 조회 없이 이 claim 으로 user 상태를 확인함.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token['is_active'] = user.is_active
+        token['is_locked'] = user.is_locked
+        return token
+
+
+def blacklist_all_tokens(user_id) -> int:
+    """
+    아직 블랙리스트에 없는 user 의 모든 OutstandingToken 을 블랙리스트에 추가함.
+    토큰 수와 관계없이 anti-join 조회 한 번과 bulk_create 로 처리하며, JWT 를 다시 파싱하지 않음.
+    """
+    token_ids = list(
+        OutstandingToken.objects
+        .filter(user_id=user_id, blacklistedtoken__isnull=True)
+        .values_list('id', flat=True)
+    )
+    if not token_ids:
+        return 0
+
+    # 동시에 같은 토큰이 블랙리스트에 추가되어도 token_id unique 충돌은 무시함
+    BlacklistedToken.objects.bulk_create(
+        [BlacklistedToken(token_id=token_id) for token_id in token_ids],
+        batch_size=BLACKLIST_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+    return len(token_ids)
+
+
+def revoke_all_tokens(user_id) -> int:
+    """
+    user 에게 지금까지 발급된 모든 토큰을 무효화함 (비밀번호 변경 시).
+    refresh 토큰은 블랙리스트에 추가하고, 블랙리스트를 확인하지 않는 access 토큰은
+    auth_user_cache 에 남긴 시각보다 iat 가 이전이면 인증 단계에서 거부함.
+    """
+    count = blacklist_all_tokens(user_id)
+    auth_user_cache.set_tokens_valid_after(user_id, datetime_to_epoch(aware_utcnow()))
+    return count
+
+
+def blacklist_last_token(user_id) -> bool:
+    """
+    user 의 가장 최근 OutstandingToken 을 블랙리스트에 추가함 (로그인 시 이전 세션 종료).
+    토큰 id 로 바로 추가하므로 JWT 를 파싱하지 않고, 이미 블랙리스트에 있으면 unique 충돌을 무시함.
+    """
+    token_id = OutstandingToken.objects \
+        .filter(user_id=user_id) \
+        .order_by('-id') \
+        .values_list('id', flat=True) \
+        .first()
+    if token_id is None:
+        return False
+
+    BlacklistedToken.objects.bulk_create([BlacklistedToken(token_id=token_id)], ignore_conflicts=True)
+    return True
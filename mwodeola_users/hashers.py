@@ -0,0 +1,46 @@
+import os
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+PBKDF2_ITERATIONS_DEFAULT = hashers.PBKDF2PasswordHasher.iterations
+PBKDF2_ITERATIONS = getattr(settings, "PASSWORD_PBKDF2_ITERATIONS", PBKDF2_ITERATIONS_DEFAULT)
+
+SCRYPT_WORK_FACTOR_DEFAULT = hashers.ScryptPasswordHasher.work_factor
+SCRYPT_WORK_FACTOR = getattr(settings, "PASSWORD_SCRYPT_WORK_FACTOR", SCRYPT_WORK_FACTOR_DEFAULT)
+
+
+# 비용을 settings 로 조절하는 hasher.
+# algorithm 이름은 Django 기본 hasher 와 같으므로 기존 해시도 그대로 검증되고,
+# 비용이 바뀌면 must_update() 로 로그인 성공 시 새 비용으로 다시 해시됨 (AbstractBaseUser.check_password).
+# 비용은 manage.py benchmark_hashers --target-ms 로 측정해서 정함.
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    iterations = PBKDF2_ITERATIONS
+
+
+class ScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    """
+    메모리를 많이 쓰는(memory-hard) scrypt. 같은 로그인 지연 시간에서 PBKDF2 보다 GPU 대입 공격에 강함.
+    PASSWORD_HASHERS 의 첫 번째로 옮기면 새 비밀번호와 로그인 시 재해시에 사용됨.
+    """
+    work_factor = SCRYPT_WORK_FACTOR
+    # OpenSSL 기본 한도(32MB)로는 work_factor 2**15 이상을 계산할 수 없으므로 필요한 만큼 늘림 (128 * n * r 바이트)
+    maxmem = 2 * 128 * SCRYPT_WORK_FACTOR * hashers.ScryptPasswordHasher.block_size
+
+
+# mwodeola_users.auth.hashing 의 프로세스 풀 worker 에서 실행되는 함수
+
+def init_hashing_worker(settings_module):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    import django
+    django.setup()
+
+
+def hashing_check_password(password, encoded):
+    return hashers.check_password(password, encoded)
+
+
+def hashing_make_password(password):
+    return hashers.make_password(password)
@@ -0,0 +1,85 @@
+import time
+
+from django.contrib.auth.hashers import get_hashers
+from django.core.management.base import BaseCommand
+
+from mwodeola_users.hashers import (
+    PBKDF2PasswordHasher,
+    ScryptPasswordHasher,
+    PBKDF2_ITERATIONS_DEFAULT,
+    SCRYPT_WORK_FACTOR_DEFAULT,
+)
+
+
+ROUNDS_DEFAULT = 5
+PASSWORD = 'benchmark-password'
+
+
+class Command(BaseCommand):
+    """
+    설정된 PASSWORD_HASHERS 의 비밀번호 검증 시간을 이 서버에서 측정함.
+    --target-ms 를 주면 그 시간에 맞는 PASSWORD_PBKDF2_ITERATIONS / PASSWORD_SCRYPT_WORK_FACTOR 를 제안함.
+    제안값은 Django 기본 비용보다 낮아지지 않으며, 그 비용으로도 목표 시간을 넘으면 경고함.
+        python manage.py benchmark_hashers --target-ms 100
+    """
+    help = 'Measures the cost of the configured password hashers on this host'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rounds', type=int, default=ROUNDS_DEFAULT,
+                            help=f'Number of verifications per hasher (default {ROUNDS_DEFAULT})')
+        parser.add_argument('--target-ms', type=float, default=None,
+                            help='Target verification time per login in milliseconds')
+
+    def handle(self, *args, **options):
+        rounds = options['rounds']
+        target_ms = options['target_ms']
+
+        for i, hasher in enumerate(get_hashers()):
+            try:
+                encoded = hasher.encode(PASSWORD, hasher.salt())
+            except (ValueError, ImportError) as e:
+                # 라이브러리가 없는 hasher (argon2, bcrypt 등)
+                self.stdout.write(f'{hasher.algorithm:<24} skipped ({e})')
+                continue
+
+            elapsed_ms = self.measure(hasher, encoded, rounds)
+            default = ' (default)' if i == 0 else ''
+            self.stdout.write(f'{hasher.algorithm:<24} {elapsed_ms:8.1f} ms/login{default}')
+
+            if target_ms is not None:
+                suggestion = self.suggest(hasher, elapsed_ms, target_ms)
+                if suggestion is not None:
+                    setting, is_floor = suggestion
+                    self.stdout.write(self.style.SUCCESS(f'{"":<24} -> {setting}'))
+                    if is_floor:
+                        self.stdout.write(self.style.WARNING(
+                            f'{"":<24}    {target_ms:g} ms is below the cost of Django\'s default parameters '
+                            f'on this host; not suggesting anything lower'))
+
+    @classmethod
+    def measure(cls, hasher, encoded, rounds) -> float:
+        started = time.perf_counter()
+        for _ in range(rounds):
+            hasher.verify(PASSWORD, encoded)
+        return (time.perf_counter() - started) * 1000 / rounds
+
+    @classmethod
+    def suggest(cls, hasher, elapsed_ms, target_ms):
+        """
+        (설정 문자열, Django 기본 비용으로 올렸는지 여부). 제안할 수 없는 hasher 는 None.
+        """
+        # 두 hasher 모두 시간이 비용 파라미터에 비례함
+        ratio = target_ms / elapsed_ms
+        if isinstance(hasher, PBKDF2PasswordHasher):
+            iterations = int(hasher.iterations * ratio) // 1000 * 1000
+            is_floor = iterations < PBKDF2_ITERATIONS_DEFAULT
+            iterations = max(iterations, PBKDF2_ITERATIONS_DEFAULT)
+            return f'PASSWORD_PBKDF2_ITERATIONS = {iterations}', is_floor
+        if isinstance(hasher, ScryptPasswordHasher):
+            # work_factor 는 2 의 거듭제곱이어야 함
+            work_factor = SCRYPT_WORK_FACTOR_DEFAULT
+            while work_factor * 2 <= hasher.work_factor * ratio:
+                work_factor *= 2
+            is_floor = SCRYPT_WORK_FACTOR_DEFAULT > hasher.work_factor * ratio
+            return f'PASSWORD_SCRYPT_WORK_FACTOR = 2 ** {work_factor.bit_length() - 1}', is_floor
+        return None
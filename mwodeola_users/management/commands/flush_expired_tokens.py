@@ -0,0 +1,88 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken, BlacklistedToken
+from rest_framework_simplejwt.utils import aware_utcnow
+
+
+BATCH_SIZE_DEFAULT = 1000
+
+# (table, column) - 이 명령과 blacklist_last_token(), _blacklist_all() 이 사용하는 인덱스
+REQUIRED_INDEXES = [
+    (OutstandingToken._meta.db_table, 'expires_at'),
+    (OutstandingToken._meta.db_table, 'user_id'),
+    (BlacklistedToken._meta.db_table, 'token_id'),
+]
+
+
+class Command(BaseCommand):
+    """
+    만료된 OutstandingToken 과 그 BlacklistedToken 을 batch 단위로 삭제함.
+    (rest_framework_simplejwt 의 flushexpiredtokens 는 한 번의 DELETE 로 처리해서 테이블이 크면 오래 잠김)
+
+    cron 등으로 주기적으로 실행:
+        python manage.py flush_expired_tokens --batch-size 1000 --sleep 0.1
+    """
+    help = 'Deletes expired outstanding/blacklisted tokens in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE_DEFAULT,
+                            help=f'Number of outstanding tokens deleted per batch (default {BATCH_SIZE_DEFAULT})')
+        parser.add_argument('--sleep', type=float, default=0,
+                            help='Seconds to sleep between batches')
+        parser.add_argument('--check-indexes', action='store_true',
+                            help='Only check the indexes used by token queries')
+
+    def handle(self, *args, **options):
+        missing = self.check_indexes()
+        if options['check_indexes']:
+            return
+
+        batch_size = options['batch_size']
+        now = aware_utcnow()
+
+        expired = OutstandingToken.objects.filter(expires_at__lte=now).order_by('expires_at')
+        total = expired.count()
+        self.stdout.write(f'{total} expired tokens')
+        if total > 0 and missing:
+            self.stdout.write(self.style.WARNING('Deleting without the indexes above may be slow'))
+
+        deleted_tokens = 0
+        deleted_blacklist = 0
+        while True:
+            token_ids = list(expired.values_list('id', flat=True)[:batch_size])
+            if not token_ids:
+                break
+
+            _, deleted = OutstandingToken.objects.filter(id__in=token_ids).delete()
+            deleted_tokens += deleted.get(OutstandingToken._meta.label, 0)
+            deleted_blacklist += deleted.get(BlacklistedToken._meta.label, 0)
+
+            self.stdout.write(f'  deleted {deleted_tokens}/{total} tokens ({deleted_blacklist} blacklisted)')
+
+            if len(token_ids) < batch_size:
+                break
+            if options['sleep'] > 0:
+                time.sleep(options['sleep'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Deleted {deleted_tokens} outstanding tokens and {deleted_blacklist} blacklisted tokens'
+        ))
+
+    def check_indexes(self) -> list:
+        missing = []
+        with connection.cursor() as cursor:
+            for table, column in REQUIRED_INDEXES:
+                constraints = connection.introspection.get_constraints(cursor, table)
+                indexed = any(
+                    constraint['columns'] and constraint['columns'][0] == column
+                    for constraint in constraints.values()
+                    if constraint['index'] or constraint['unique'] or constraint['primary_key']
+                )
+                if indexed:
+                    self.stdout.write(f'index ok: {table}({column})')
+                else:
+                    missing.append((table, column))
+                    self.stdout.write(self.style.WARNING(f'index missing: {table}({column})'))
+        return missing
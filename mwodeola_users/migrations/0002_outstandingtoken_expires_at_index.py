@@ -0,0 +1,18 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mwodeola_users', '0001_initial'),
+        ('token_blacklist', '0011_linearizes_history'),
+    ]
+
+    # 만료 토큰 정리(flush_expired_tokens)용 인덱스. token_blacklist 앱의 모델이라 RunSQL 로 추가함
+    operations = [
+        migrations.RunSQL(
+            sql='CREATE INDEX IF NOT EXISTS token_blacklist_outstandingtoken_expires_at '
+                'ON token_blacklist_outstandingtoken (expires_at);',
+            reverse_sql='DROP INDEX IF EXISTS token_blacklist_outstandingtoken_expires_at;',
+        ),
+    ]
@@ -2,6 +2,8 @@ from django.db import models
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
 from django.core.validators import RegexValidator
 from .managers import MwodeolaUserManager
+from .auth.caches import auth_user_cache
+from .auth.hashing import password_hashing
 import uuid
 
 
@@ -43,6 +45,31 @@ class MwodeolaUser(AbstractBaseUser, PermissionsMixin):
 
     objects = MwodeolaUserManager()
 
+    # 비밀번호 해시는 password_hashing 에서 계산함 (AUTH_HASHING.WORKERS 가 있으면 프로세스 풀)
+    # (create_user(), authenticate(), 비밀번호 변경 모두 이 두 메서드를 거침)
+    def set_password(self, raw_password):
+        self.password = password_hashing.make_password(raw_password)
+        self._password = raw_password
+
+    def check_password(self, raw_password):
+        def setter(raw_password):
+            self.set_password(raw_password)
+            self._password = None
+            self.save(update_fields=['password'])
+        return password_hashing.check_password(raw_password, self.password, setter)
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        auth_user_cache.invalidate(self.id)
+        auth_user_cache.set_state(self.id, self.is_active, self.is_locked)
+
+    def delete(self, *args, **kwargs):
+        user_id = self.id
+        result = super().delete(*args, **kwargs)
+        auth_user_cache.invalidate(user_id)
+        auth_user_cache.set_state(user_id, False, False)
+        return result
+
     def __str__(self):
         if self.is_superuser:
             return f'[Admin] {self.user_name}({self.phone_number})'
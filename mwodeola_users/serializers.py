@@ -1,4 +1,5 @@
 from abc import ABC
+from django.conf import settings
 from django.contrib.auth.models import update_last_login
 from django.core.validators import RegexValidator
 from django.utils.translation import gettext_lazy as _
@@ -9,6 +10,7 @@ from rest_framework_simplejwt.settings import api_settings
 from rest_framework_simplejwt.exceptions import TokenError
 from .models import MwodeolaUser, PHONE_NUMBER_REGEX_VALIDATOR
 from .auth.mixins import UserAuthMixin
+from .auth.tokens import MwodeolaRefreshToken, revoke_all_tokens
 from .serializers_token import (
     TokenObtainPairSerializer,
     TokenBlacklistSerializer,
@@ -16,6 +18,11 @@ from .serializers_token import (
 )
 
 
+REVOKE_TOKENS_ON_PASSWORD_CHANGE_DEFAULT = False
+REVOKE_TOKENS_ON_PASSWORD_CHANGE = getattr(settings, "AUTH_REVOKE_TOKENS_ON_PASSWORD_CHANGE",
+                                           REVOKE_TOKENS_ON_PASSWORD_CHANGE_DEFAULT)
+
+
 class BaseSerializer(serializers.Serializer):
 
     def __init__(self, instance=None, data=empty, **kwargs):
@@ -113,7 +120,7 @@ class SignUpSerializer(BaseModelSerializer):
         user = MwodeolaUser.objects.create_user(
             user_name, email, phone_number, password)
 
-        refresh = RefreshToken.for_user(user)
+        refresh = MwodeolaRefreshToken.for_user(user)
 
         self.results['refresh'] = str(refresh)
         self.results['access'] = str(refresh.access_token)
@@ -162,11 +169,15 @@ class SignInAutoSerializer(BaseSerializer):
             return False
 
         try:
-            RefreshToken(self.old_refresh).blacklist()
+            # view 에서 request.auth(검증된 RefreshToken)를 넘겨주면 다시 파싱하지 않음
+            if isinstance(self.old_refresh, RefreshToken):
+                self.old_refresh.blacklist()
+            else:
+                RefreshToken(self.old_refresh).blacklist()
         except TokenError as e:
             pass
 
-        refresh = RefreshToken.for_user(self.user)
+        refresh = MwodeolaRefreshToken.for_user(self.user)
 
         self.results['refresh'] = str(refresh)
         self.results['access'] = str(refresh.access_token)
@@ -241,6 +252,10 @@ class PasswordAuthSerializer(UserAuthMixin, BaseSerializer):
 
 
 class PasswordChangeSerializer(BaseSerializer, UserAuthMixin):
+    """
+    AUTH_REVOKE_TOKENS_ON_PASSWORD_CHANGE 이 True 이면 이전 토큰을 모두 무효화하고 응답에 새 refresh/access 토큰을 내려줌.
+    기본값(False)에서는 기존처럼 비밀번호만 바꾸고 빈 응답을 내려줌.
+    """
     old_password = PasswordField()
     new_password = PasswordField()
 
@@ -269,6 +284,16 @@ class PasswordChangeSerializer(BaseSerializer, UserAuthMixin):
         new_password = validated_data['new_password']
         instance.set_password(new_password)
         instance.save()
+
+        if not REVOKE_TOKENS_ON_PASSWORD_CHANGE:
+            return {}
+
+        # 다른 세션을 포함해 이전에 발급된 토큰은 모두 무효화하고, 요청한 세션에는 새 토큰을 발급함
+        revoke_all_tokens(instance.id)
+        refresh = MwodeolaRefreshToken.for_user(instance)
+
+        self.results['refresh'] = str(refresh)
+        self.results['access'] = str(refresh.access_token)
         return {}
 
 
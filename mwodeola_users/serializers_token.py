@@ -2,7 +2,6 @@ from abc import abstractmethod
 
 from django.contrib import auth
 from django.contrib.auth.models import update_last_login
-from django.core.exceptions import ObjectDoesNotExist
 from django.utils.translation import gettext_lazy as _
 from rest_framework import exceptions, serializers, status
 from rest_framework.exceptions import ValidationError
@@ -10,10 +9,10 @@ from rest_framework.fields import empty
 
 from rest_framework_simplejwt.settings import api_settings
 from rest_framework_simplejwt.tokens import RefreshToken, UntypedToken
-from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
 from rest_framework_simplejwt.exceptions import TokenError
 
 from .auth.mixins import UserAuthMixin
+from .auth.tokens import MwodeolaRefreshToken, blacklist_last_token
 
 if api_settings.BLACKLIST_AFTER_ROTATION:
     from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
@@ -31,9 +30,11 @@ class PasswordField(serializers.CharField):
 
 class BaseTokenSerializer(serializers.Serializer):
 
-    def __init__(self, instance=None, data=empty, **kwargs):
+    def __init__(self, instance=None, data=empty, token=None, **kwargs):
         super().__init__(instance, data, **kwargs)
 
+        # view 의 인증 단계에서 이미 검증한 토큰(request.auth). 있으면 다시 파싱/검증하지 않음
+        self.token = token
         self.results = {}
         self.err_messages = {}
         self.err_status = status.HTTP_401_UNAUTHORIZED
@@ -82,25 +83,11 @@ class TokenObtainPairSerializer(UserAuthMixin, BaseTokenSerializer):
     @classmethod
     def get_token(cls, user):
         cls.blacklist_last_token(user)
-        return RefreshToken.for_user(user)
+        return MwodeolaRefreshToken.for_user(user)
 
     @classmethod
     def blacklist_last_token(cls, user):
-        user_id = user.pk
-        try:
-            latest_token_queryset = OutstandingToken.objects \
-                .filter(user_id=user_id) \
-                .latest('id')
-
-            is_blacklist = BlacklistedToken.objects \
-                .filter(token_id=latest_token_queryset.id) \
-                .exists()
-
-            if not is_blacklist:
-                RefreshToken(latest_token_queryset.token).blacklist()
-
-        except (ObjectDoesNotExist, TokenError):
-            pass
+        blacklist_last_token(user.pk)
 
 
 class TokenRefreshSerializer(BaseTokenSerializer):
@@ -111,7 +98,10 @@ class TokenRefreshSerializer(BaseTokenSerializer):
         if not super().is_valid(False):
             return False
 
-        refresh = RefreshToken(self.validated_data['refresh'])
+        if self.token is not None:
+            refresh = self.token
+        else:
+            refresh = RefreshToken(self.validated_data['refresh'])
 
         self.results['access'] = str(refresh.access_token)
 
@@ -166,7 +156,7 @@ class TokenBlacklistSerializer(BaseTokenSerializer):
             return False
 
         try:
-            refresh = RefreshToken(self.validated_data['refresh'])
+            refresh = self.token if self.token is not None else RefreshToken(self.validated_data['refresh'])
         except TokenError as e:
             self.err_messages['detail'] = e.args[0]
             self.err_messages['code'] = 'blacklist_token_error'
@@ -10,7 +10,7 @@ from rest_framework_simplejwt.token_blacklist.models import OutstandingToken, Bl
 
 from _mwodeola.utils import get_random_secret_key_str
 from mwodeola_users.models import MwodeolaUser
-from .auth import get_raw_token, get_user_from_request_token
+from .auth import get_raw_token
 from .auth.authentications import JWTAuthenticationForRefresh
 from .serializers_token import TokenRefreshSerializer, TokenBlacklistSerializer
 from .serializers import (
@@ -138,7 +138,7 @@ class SignInVerifyView(BaseSignView):
 #  TODO: 유저 phone_number 로 문자 발송 구현 예정.
 class SignInView(BaseSignView):
     def post(self, request):
-        self.serializer = SignInSerializer(data=request.data)
+        self.serializer = SignInSerializer(data=request.data, context={'request': request})
         return super().post(request)
 
 
@@ -147,9 +147,7 @@ class SignInAutoView(BaseSignView):
     authentication_classes = [JWTAuthenticationForRefresh]
 
     def get(self, request):
-        user = get_user_from_request_token(request)
-        refresh_token = get_raw_token(request)
-        self.serializer = SignInAutoSerializer(user=user, refresh_token=refresh_token)
+        self.serializer = SignInAutoSerializer(user=request.user, refresh_token=request.auth)
         return super().get(request)
 
 
@@ -160,7 +158,7 @@ class SignOutView(BaseSignView):
     def put(self, request):
         raw_token = get_raw_token(request)
         data = {'refresh': raw_token}
-        self.serializer = SignOutSerializer(data=data)
+        self.serializer = SignOutSerializer(data=data, token=request.auth)
         return super().put(request)
 
 
@@ -172,8 +170,7 @@ class WithdrawalView(BaseSignView):
     authentication_classes = [JWTAuthenticationForRefresh]
 
     def delete(self, request):
-        user = get_user_from_request_token(request)
-        self.serializer = WithdrawalSerializer(user, data=request.data)
+        self.serializer = WithdrawalSerializer(request.user, data=request.data, context={'request': request})
         return super().delete(request)
 
 
@@ -182,8 +179,7 @@ class UserInfoView(BaseSignView):
     authentication_classes = [JWTAuthenticationForRefresh]
 
     def get(self, request):
-        user = get_user_from_request_token(request)
-        serializer = UserInfoSerializer(user)
+        serializer = UserInfoSerializer(request.user)
         return JsonResponse(serializer.data, status=status.HTTP_200_OK)
 
 
@@ -209,10 +205,9 @@ class AuthFailedCountView(BaseSignView):
             request.user.is_locked = True
             request.user.save()
 
-            header = self.get_header(request)
-            raw_token = self.get_raw_token(header).decode()
+            raw_token = get_raw_token(request)
             data = {'refresh': raw_token}
-            serializer = TokenBlacklistSerializer(data=data)
+            serializer = TokenBlacklistSerializer(data=data, token=request.auth)
             serializer.is_valid()
             return HttpResponse(status=status.HTTP_200_OK)
 
@@ -227,7 +222,7 @@ class TokenRefreshView(BaseSignView):
     def get(self, request):
         raw_token = get_raw_token(request)
         data = {'refresh': raw_token}
-        self.serializer = TokenRefreshSerializer(data=data)
+        self.serializer = TokenRefreshSerializer(data=data, token=request.auth)
         return super().get(request)
 
 
@@ -236,8 +231,7 @@ class PasswordAuthView(BaseSignView):
     authentication_classes = [JWTAuthenticationForRefresh]
 
     def post(self, request):
-        user = get_user_from_request_token(request)
-        self.serializer = PasswordAuthSerializer(user, data=request.data)
+        self.serializer = PasswordAuthSerializer(request.user, data=request.data, context={'request': request})
         return super().post(request)
 
 
@@ -246,8 +240,7 @@ class PasswordChangeView(BaseSignView):
     authentication_classes = [JWTAuthenticationForRefresh]
 
     def put(self, request):
-        user = get_user_from_request_token(request)
-        self.serializer = PasswordChangeSerializer(user, data=request.data)
+        self.serializer = PasswordChangeSerializer(request.user, data=request.data, context={'request': request})
         return super().put(request)
 
 
@@ -262,10 +255,9 @@ class UserLockView(BaseSignView):
     authentication_classes = [JWTAuthenticationForRefresh]
 
     def post(self, request):
-        header = self.get_header(request)
-        raw_token = self.get_raw_token(header).decode()
+        raw_token = get_raw_token(request)
         data = {'refresh': raw_token}
-        serializer = TokenBlacklistSerializer(data=data)
+        serializer = TokenBlacklistSerializer(data=data, token=request.auth)
         if serializer.is_valid():
             request.user.is_locked = True
             request.user.save()